@@ -0,0 +1,123 @@
+"""Benchmark bulk event scheduling against the per-event loop.
+
+Run with:
+    python benchmarks/bench_add_future_events.py
+
+NumPy input is benchmarked as well when NumPy is installed. Each measurement
+runs in a fresh interpreter, so the events a previous measurement allocated
+don't slow the next one down.
+"""
+
+import gc
+import random
+import subprocess
+import sys
+import time
+
+from time_travel import TimeTravel
+
+
+EVENT_COUNTS = [10000, 100000, 1000000]
+
+
+def _columns(count, fds=1000):
+    rand = random.Random(count)
+    times = [rand.random() * count for _ in range(count)]
+    fd_column = [rand.randrange(fds) for _ in range(count)]
+    event_column = [rand.choice((1, 4)) for _ in range(count)]
+    return times, fd_column, event_column
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def per_event(t, times, fds, events):
+    """Schedule the events one by one."""
+    for time_from_now, fd, event in zip(times, fds, events):
+        t.add_future_event(time_from_now, fd, event)
+
+
+def bulk(t, times, fds, events):
+    """Schedule the events with a single call."""
+    t.add_future_events(times, fds, events)
+
+
+def bulk_gc_paused(t, times, fds, events):
+    """Schedule the events with a single call, pausing the collector."""
+    gc.disable()
+    try:
+        t.add_future_events(times, fds, events)
+    finally:
+        gc.enable()
+
+
+WORKLOADS = {
+    'per-event': per_event,
+    'bulk': bulk,
+    'bulk-gc-paused': bulk_gc_paused,
+}
+
+
+def _timed_in_fresh_interpreter(workload, count, use_numpy=False):
+    """Return the time it takes to run the workload in a new interpreter."""
+    args = [sys.executable, __file__, workload, str(count)]
+    if use_numpy:
+        args.append('numpy')
+
+    return float(subprocess.check_output(args, universal_newlines=True))
+
+
+def run(workload, count, use_numpy=False):
+    """Print the time it takes to run the workload."""
+    times, fds, events = _columns(count)
+
+    if use_numpy:
+        import numpy
+        times, fds, events = (numpy.array(times),
+                              numpy.array(fds),
+                              numpy.array(events))
+
+    print(_timed(WORKLOADS[workload], TimeTravel(), times, fds, events))
+
+
+def main():
+    """Print the time it takes to schedule each workload."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        has_numpy = False
+    else:
+        has_numpy = True
+
+    print('{:>10} {:>16} {:>16} {:>20} {:>16}'.format('events',
+                                                      'per-event (s)',
+                                                      'bulk (s)',
+                                                      'bulk gc paused (s)',
+                                                      'bulk numpy (s)'))
+
+    for count in EVENT_COUNTS:
+        loop_time = _timed_in_fresh_interpreter('per-event', count)
+        bulk_time = _timed_in_fresh_interpreter('bulk', count)
+        paused_time = _timed_in_fresh_interpreter('bulk-gc-paused', count)
+
+        if has_numpy:
+            numpy_time = '{:>16.3f}'.format(
+                _timed_in_fresh_interpreter('bulk', count, use_numpy=True))
+        else:
+            numpy_time = '{:>16}'.format('-')
+
+        print('{:>10} {:>16.3f} {:>16.3f} {:>20.3f} {}'.format(count,
+                                                               loop_time,
+                                                               bulk_time,
+                                                               paused_time,
+                                                               numpy_time))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run(sys.argv[1], int(sys.argv[2]), use_numpy='numpy' in sys.argv[3:])
+    else:
+        main()
@@ -0,0 +1,36 @@
+"""Benchmark entering and leaving TimeTravel, armed and not.
+
+Run with:
+    python benchmarks/bench_armed.py
+"""
+
+import timeit
+
+from time_travel import TimeTravel
+
+
+ENTRIES = 100
+
+
+def _enter():
+    with TimeTravel():
+        pass
+
+
+def main():
+    """Print the time of a TimeTravel entry, with and without arming."""
+    _enter()
+    plain = min(timeit.repeat(_enter, number=ENTRIES, repeat=3)) / ENTRIES
+
+    TimeTravel.arm()
+    try:
+        armed = min(timeit.repeat(_enter, number=ENTRIES, repeat=3)) / ENTRIES
+    finally:
+        TimeTravel.disarm()
+
+    print('{:>10} {:>10.1f}us'.format('plain', plain * 1e6))
+    print('{:>10} {:>10.1f}us'.format('armed', armed * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark the fake datetime types against the real ones.
+
+Run with:
+    python benchmarks/bench_datetime.py
+
+Each case is timed with the real types and with the fake types of an active
+datetime patcher, whose clock stays at the same time.
+"""
+
+import datetime
+import pickle
+import timeit
+
+from time_travel.patchers.datetime_patcher import (DatetimePatcher,
+                                                   FakeDate,
+                                                   FakeDatetime)
+from time_travel.time_machine_clock import TimeMachineClock
+
+
+NUMBER = 10 ** 5
+
+ZONES = [datetime.timezone(datetime.timedelta(minutes=30 * offset))
+         for offset in range(-20, 20)]
+
+# (name, statement), the statement uses the `datetime` and `date` types, a
+# `dt` datetime instance, `delta`, `zones` and `pickle`.
+CASES = [
+    ('datetime.now()', 'datetime.now()'),
+    ('datetime.utcnow()', 'datetime.utcnow()'),
+    ('date.today()', 'date.today()'),
+    ('now(tz), {} zones'.format(len(ZONES)),
+     '[datetime.now(tz) for tz in zones]'),
+    ('isinstance(dt, datetime)', 'isinstance(dt, datetime)'),
+    ('isinstance(dt, date)', 'isinstance(dt, date)'),
+    ('isinstance(1, datetime)', 'isinstance(1, datetime)'),
+    ('datetime(...)', 'datetime(2020, 1, 2, 3, 4, 5)'),
+    ('date(...)', 'date(2020, 1, 2)'),
+    ('dt + delta', 'dt + delta'),
+    ('dt - delta', 'dt - delta'),
+    ('dt - dt', 'dt - dt'),
+    ('dt.replace(...)', 'dt.replace(year=2021)'),
+    ('pickle dt', 'pickle.loads(pickle.dumps(dt))'),
+]
+
+
+def _time(statement, datetime_type, date_type):
+    namespace = {'datetime': datetime_type,
+                 'date': date_type,
+                 'dt': datetime_type(2020, 1, 2, 3, 4, 5),
+                 'delta': datetime.timedelta(hours=1),
+                 'zones': ZONES,
+                 'pickle': pickle}
+    return min(timeit.repeat(statement,
+                             globals=namespace,
+                             number=NUMBER,
+                             repeat=3)) / NUMBER
+
+
+def main():
+    """Print the time of each case with the real and the fake types."""
+    patcher = DatetimePatcher(clock=TimeMachineClock(),
+                              event_pool=None,
+                              modules_to_patch=__name__)
+
+    print('{:>26} {:>10} {:>10} {:>8}'.format('', 'real', 'fake', 'ratio'))
+    for name, statement in CASES:
+        real = _time(statement, datetime.datetime, datetime.date)
+        patcher.start()
+        try:
+            fake = _time(statement, FakeDatetime, FakeDate)
+        finally:
+            patcher.stop()
+
+        print('{:>26} {:>8.0f}ns {:>8.0f}ns {:>8.1f}'.format(
+            name, real * 1e9, fake * 1e9, fake / real))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark the event pool's next-event lookup as the pool grows.
+
+Run with:
+    python benchmarks/bench_event_pool.py
+
+The predicates only match a couple of the fds ("predicate") or none of them
+("no match"), so most of the pool is looked at. Those lookups are linear in
+the size of the pool, as they were before the timestamps heap.
+"""
+
+import random
+import timeit
+
+from time_travel.event_pool import EventPool
+
+
+POOL_SIZES = [1000, 10000, 100000, 300000]
+CALLS = 200
+PREDICATE_CALLS = 10
+
+
+def build_pool(size, fds=50):
+    """Return a pool with `size` events spread over `fds` descriptors."""
+    pool = EventPool()
+    rand = random.Random(size)
+
+    for _ in range(size):
+        pool.add_future_event(86400.0 + rand.random() * size,
+                              rand.randrange(fds),
+                              'READ')
+
+    return pool
+
+
+def main():
+    """Print the per-call cost of `get_next_event` for each pool size."""
+    print('{:>10} {:>22} {:>22} {:>22} {:>22}'.format(
+        'events',
+        'no predicate (us/call)',
+        'predicate (us/call)',
+        'no match (us/call)',
+        'for fds (us/call)'))
+
+    for size in POOL_SIZES:
+        pool = build_pool(size, fds=size // 2)
+        waited_fds = {1, 2}
+
+        def _predicate(fd, event):
+            return fd in waited_fds
+
+        def _no_match(fd, event):
+            return False
+
+        plain = timeit.timeit(pool.get_next_event, number=CALLS)
+        filtered = timeit.timeit(lambda: pool.get_next_event(_predicate),
+                                 number=PREDICATE_CALLS)
+        no_match = timeit.timeit(lambda: pool.get_next_event(_no_match),
+                                 number=PREDICATE_CALLS)
+        for_fds = timeit.timeit(
+            lambda: pool.get_next_event_for_fds(waited_fds),
+            number=CALLS)
+
+        print('{:>10} {:>22.2f} {:>22.2f} {:>22.2f} {:>22.2f}'.format(
+            size,
+            plain / CALLS * 1e6,
+            filtered / PREDICATE_CALLS * 1e6,
+            no_match / PREDICATE_CALLS * 1e6,
+            for_fds / CALLS * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark the memory cost of the event pool layouts.
+
+Run with:
+    python benchmarks/bench_event_pool_memory.py
+
+The events are spread over random (unique) timestamps, the best case of the
+compact layout. The time to add many fds to a single shared timestamp is
+measured as well.
+"""
+
+import random
+import timeit
+import tracemalloc
+
+from time_travel.event_pool import EventPool, CompactEventPool
+
+
+EVENT_COUNTS = [10000, 100000, 1000000]
+SHARED_FD_COUNTS = [2000, 8000, 16000]
+
+
+def bytes_per_event(pool_class, count, fds=1000):
+    """Return the bytes allocated per event for a pool of `count` events."""
+    rand = random.Random(count)
+    columns = ([86400.0 + rand.random() * count for _ in range(count)],
+               [rand.randrange(fds) for _ in range(count)],
+               [rand.choice((1, 4)) for _ in range(count)])
+
+    tracemalloc.start()
+    try:
+        pool = pool_class()
+        pool.add_future_events(*columns)
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # The timestamps themselves are allocated by the columns, the pool only
+    # references them.
+    del pool
+    return allocated / float(count)
+
+
+def shared_timestamp_time(pool_class, count):
+    """Return the seconds it takes to add `count` fds to a single timestamp."""
+    pool = pool_class()
+
+    start = timeit.default_timer()
+    pool.add_future_events([86400.0] * count, range(count), [1] * count)
+    return timeit.default_timer() - start
+
+
+def main():
+    """Print the bytes per event of each layout."""
+    print('{:>10} {:>18} {:>22}'.format('events', 'EventPool (B)',
+                                        'CompactEventPool (B)'))
+
+    for count in EVENT_COUNTS:
+        print('{:>10} {:>18.1f} {:>22.1f}'.format(
+            count,
+            bytes_per_event(EventPool, count),
+            bytes_per_event(CompactEventPool, count)))
+
+    print('')
+    print('{:>10} {:>18} {:>22}'.format('shared fds', 'EventPool (ms)',
+                                        'CompactEventPool (ms)'))
+
+    for count in SHARED_FD_COUNTS:
+        print('{:>10} {:>18.1f} {:>22.1f}'.format(
+            count,
+            shared_timestamp_time(EventPool, count) * 1e3,
+            shared_timestamp_time(CompactEventPool, count) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark the import time of time_travel and its first TimeTravel().
+
+Run with:
+    python benchmarks/bench_import.py
+
+Each measurement runs in a fresh interpreter. The import time is read from
+`python -X importtime`, and the slowest modules imported by it are listed.
+"""
+
+import subprocess
+import sys
+
+
+RUNS = 5
+SLOWEST = 10
+
+CONSTRUCT = '''
+import timeit
+start = timeit.default_timer()
+import time_travel
+time_travel.TimeTravel()
+print(timeit.default_timer() - start)
+'''
+
+
+def _import_times():
+    """Return [(cumulative_us, module), ...] of `import time_travel`."""
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', 'import time_travel'],
+        stderr=subprocess.STDOUT, universal_newlines=True)
+
+    times = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, module = line[len('import time:'):].split('|')
+        times.append((int(cumulative), module.rstrip()))
+
+    return times
+
+
+def main():
+    """Print the import time and the time to the first TimeTravel()."""
+    runs = [_import_times() for _ in range(RUNS)]
+    best = min(runs, key=lambda times: times[-1][0])
+
+    print('import time_travel: {:.1f}ms (best of {})'.format(
+        best[-1][0] / 1e3, RUNS))
+    for cumulative, module in sorted(best, reverse=True)[:SLOWEST]:
+        print('{:>10.1f}ms {}'.format(cumulative / 1e3, module))
+
+    construct = min(float(subprocess.check_output(
+        [sys.executable, '-c', CONSTRUCT], universal_newlines=True))
+        for _ in range(RUNS))
+    print('import and first TimeTravel(): {:.1f}ms'.format(construct * 1e3))
+
+
+if __name__ == '__main__':
+    main()
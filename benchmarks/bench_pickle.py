@@ -0,0 +1,77 @@
+"""Benchmark pickling a list of datetimes while datetime is patched.
+
+Run with:
+    python benchmarks/bench_pickle.py [count]
+
+While the datetime patcher is started, real datetimes are pickled to unpickle
+as fake ones. The "fields" row uses a reducer that rebuilds the datetime from
+its eight fields, which is how the patcher reduced them before it kept the
+real datetime's binary state.
+"""
+
+import copyreg
+import datetime
+import pickle
+import sys
+import timeit
+
+from time_travel.patchers.datetime_patcher import (DatetimePatcher,
+                                                   FakeDatetime)
+from time_travel.time_machine_clock import TimeMachineClock
+
+
+PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+def _reduce_by_fields(datetime_):
+    return FakeDatetime, (datetime_.year,
+                          datetime_.month,
+                          datetime_.day,
+                          datetime_.hour,
+                          datetime_.minute,
+                          datetime_.second,
+                          datetime_.microsecond,
+                          datetime_.tzinfo)
+
+
+def _measure(payload):
+    dumps = min(timeit.repeat(lambda: pickle.dumps(payload, PROTOCOL),
+                              number=1, repeat=3))
+    data = pickle.dumps(payload, PROTOCOL)
+    loads = min(timeit.repeat(lambda: pickle.loads(data), number=1, repeat=3))
+    return dumps, loads, len(data)
+
+
+def main():
+    """Print the time to pickle and unpickle the datetimes."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    start = datetime.datetime(2020, 1, 1)
+    payload = [start + datetime.timedelta(seconds=index)
+               for index in range(count)]
+
+    patcher = DatetimePatcher(clock=TimeMachineClock(),
+                              event_pool=None,
+                              modules_to_patch=__name__)
+
+    # The module's own references are patched while the patcher is started.
+    real_datetime = datetime.datetime
+    rows = [('real', _measure(payload))]
+
+    patcher.start()
+    try:
+        rows.append(('patched', _measure(payload)))
+
+        copyreg.dispatch_table[real_datetime] = _reduce_by_fields
+        rows.append(('fields', _measure(payload)))
+    finally:
+        patcher.stop()
+
+    print('{} datetimes'.format(count))
+    print('{:>10} {:>10} {:>10} {:>12}'.format('', 'dumps', 'loads', 'bytes'))
+    for name, (dumps, loads, size) in rows:
+        print('{:>10} {:>9.3f}s {:>9.3f}s {:>12}'.format(
+            name, dumps, loads, size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark driving a simulation with run_until against a select loop.
+
+Run with:
+    python benchmarks/bench_run_until.py [events]
+
+Each event of a socket schedules the socket's next event, so the pool always
+holds one event per socket. The time is measured with `timeit.default_timer`,
+which the select loop's patching of this module doesn't touch.
+
+run_until_idle is also measured with the sockets' events staggered (every
+socket's events at a different time) for a growing number of sockets, where
+each timestamp holds a single event, and in short steps with a single idle
+handler while many events of fds without a handler are ahead of it.
+"""
+
+import select
+import socket
+import sys
+import timeit
+
+from time_travel import TimeTravel
+
+
+SOCKETS = 100
+STAGGERED_SOCKETS = [10, 100, 1000]
+UNHANDLED_EVENTS = [1000, 10000, 100000]
+STEPS = 100
+
+
+def _select_loop(count):
+    with TimeTravel(modules_to_patch=__name__) as t:
+        socks = [socket.socket() for _ in range(SOCKETS)]
+        for sock in socks:
+            t.add_future_event(1, sock, t.event_types.select.READ)
+
+        start = timeit.default_timer()
+        handled = 0
+        while handled < count:
+            readable, _, _ = select.select(socks, [], [])
+            for sock in readable:
+                t.add_future_event(1, sock, t.event_types.select.READ)
+                handled += 1
+
+        elapsed = timeit.default_timer() - start
+
+        for sock in socks:
+            sock.close()
+
+        return elapsed
+
+
+def _run_until(count, sockets=SOCKETS, staggered=False):
+    t = TimeTravel()
+    socks = [socket.socket() for _ in range(sockets)]
+    handled = [0]
+
+    def handler(fd, event):
+        handled[0] += 1
+        if handled[0] < count:
+            t.add_future_event(1, fd, event)
+
+    for index, sock in enumerate(socks):
+        t.set_event_handler(sock, handler)
+        offset = float(index) / sockets if staggered else 0
+        t.add_future_event(1 + offset, sock, t.event_types.select.READ)
+
+    start = timeit.default_timer()
+    t.run_until_idle()
+    elapsed = timeit.default_timer() - start
+
+    for sock in socks:
+        sock.close()
+
+    return elapsed
+
+
+def _run_until_steps(unhandled):
+    t = TimeTravel()
+    sock = socket.socket()
+    t.set_event_handler(sock, lambda fd, event: None)
+
+    t.add_future_events([1 + index for index in range(unhandled)],
+                        [index for index in range(unhandled)],
+                        [t.event_types.select.READ] * unhandled)
+
+    start = timeit.default_timer()
+    for _ in range(STEPS):
+        t.run_until(t.clock.time + 0.001)
+    elapsed = timeit.default_timer() - start
+
+    sock.close()
+    return elapsed
+
+
+def main():
+    """Print the time it takes to handle the events both ways."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+
+    print('{} events on {} sockets'.format(count, SOCKETS))
+    for name, func in [('select loop', _select_loop),
+                       ('run_until_idle', _run_until)]:
+        elapsed = func(count)
+        print('{:>15} {:>10.3f}s ({:.0f} ns/event)'.format(
+            name, elapsed, elapsed / count * 1e9))
+
+    print('run_until_idle, staggered events')
+    for sockets in STAGGERED_SOCKETS:
+        elapsed = _run_until(count, sockets, staggered=True)
+        print('{:>7} sockets {:>10.3f}s ({:.0f} ns/event)'.format(
+            sockets, elapsed, elapsed / count * 1e9))
+
+    print('run_until in {} steps of 1ms, unhandled events ahead'.format(STEPS))
+    for unhandled in UNHANDLED_EVENTS:
+        elapsed = _run_until_steps(unhandled)
+        print('{:>7} events {:>10.3f}s ({:.0f} us/step)'.format(
+            unhandled, elapsed, elapsed / STEPS * 1e6))
+
+
+if __name__ == '__main__':
+    main()
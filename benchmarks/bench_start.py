@@ -0,0 +1,86 @@
+"""Benchmark entering and leaving TimeTravel with many loaded modules.
+
+Run with:
+    python benchmarks/bench_start.py
+
+Synthetic modules, each with a few dozen attributes, are added to
+`sys.modules` to get to the measured module counts. The "per patcher" columns
+start each patcher on its own, each searching all the modules, which is how
+TimeTravel.start worked before the shared search.
+"""
+
+import itertools
+import sys
+import timeit
+import types
+
+from time_travel import TimeTravel
+from time_travel.patchers.base_patcher import BasePatcher
+
+
+MODULE_COUNTS = [500, 1000, 3000]
+ATTRIBUTES = 50
+ENTRIES = 10
+
+_module_indices = itertools.count()
+
+
+def _add_modules(count):
+    names = []
+    for index in itertools.islice(_module_indices, count):
+        module = types.ModuleType('_bench_start_{}'.format(index))
+        for attr in range(ATTRIBUTES):
+            setattr(module, 'attr_{}'.format(attr), attr)
+
+        sys.modules[module.__name__] = module
+        names.append(module.__name__)
+
+    return names
+
+
+def _per_patcher_start(t):
+    for patcher in t.patches:
+        patcher.start()
+
+
+def _enter(start, cached):
+    if not cached:
+        BasePatcher.clear_scan_cache()
+
+    t = TimeTravel()
+    begin = timeit.default_timer()
+    start(t)
+    t.stop()
+    return timeit.default_timer() - begin
+
+
+def _measure(start, cached):
+    if cached:
+        _enter(start, False)
+
+    return min(_enter(start, cached) for _ in range(ENTRIES)) * 1e3
+
+
+def main():
+    """Print the time of a TimeTravel entry by the number of modules."""
+    added = []
+    print('{:>10} {:>24} {:>24}'.format('', 'per patcher', 'shared'))
+    print('{:>10} {:>12} {:>12} {:>12} {:>12}'.format(
+        'modules', 'uncached', 'cached', 'uncached', 'cached'))
+
+    for count in MODULE_COUNTS:
+        added.extend(_add_modules(count - len(sys.modules)))
+
+        print('{:>10} {:>10.1f}ms {:>10.1f}ms {:>10.1f}ms {:>10.1f}ms'.format(
+            len(sys.modules),
+            _measure(_per_patcher_start, False),
+            _measure(_per_patcher_start, True),
+            _measure(TimeTravel.start, False),
+            _measure(TimeTravel.start, True)))
+
+    for name in added:
+        del sys.modules[name]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark formatting the current time with the patched time module.
+
+Run with:
+    python benchmarks/bench_time_strings.py
+
+Each call is timed with the real functions and with the patched ones, with
+the clock moving a millisecond per call (so a thousand calls per virtual
+second, as a log-heavy simulation makes).
+"""
+
+import time
+import timeit
+
+from time_travel.patchers.time_patcher import TimePatcher
+from time_travel.time_machine_clock import TimeMachineClock
+
+
+NUMBER = 10 ** 5
+
+CASES = [
+    ('localtime()', lambda: time.localtime()),
+    ('gmtime()', lambda: time.gmtime()),
+    ('ctime()', lambda: time.ctime()),
+    ('strftime(format)', lambda: time.strftime('%Y-%m-%d %H:%M:%S')),
+]
+
+
+def main():
+    """Print the time of each call, real and patched."""
+    clock = TimeMachineClock()
+    patcher = TimePatcher(clock=clock,
+                          event_pool=None,
+                          modules_to_patch=__name__)
+
+    def _tick():
+        clock.time += 0.001
+
+    tick = min(timeit.repeat(_tick, number=NUMBER, repeat=3))
+
+    print('{:>20} {:>10} {:>10}'.format('', 'real', 'patched'))
+    for name, call in CASES:
+        def _call_and_tick():
+            call()
+            clock.time += 0.001
+
+        real = min(timeit.repeat(call, number=NUMBER, repeat=3))
+
+        patcher.start()
+        try:
+            patched = min(timeit.repeat(_call_and_tick,
+                                        number=NUMBER,
+                                        repeat=3)) - tick
+        finally:
+            patcher.stop()
+
+        print('{:>20} {:>8.0f}ns {:>8.0f}ns'.format(
+            name, real / NUMBER * 1e9, patched / NUMBER * 1e9))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark scheduling, cancelling and firing clock timers.
+
+Run with:
+    python benchmarks/bench_timing_wheel.py [timers]
+
+The timers are spread over a day of clock time. With the default of 10 ** 6
+timers this needs a few hundred MB; 10 ** 7 timers need a few GB.
+"""
+
+import random
+import sys
+import time
+
+from time_travel.time_machine_clock import TimeMachineClock
+
+
+DAY = 86400
+
+
+def _noop():
+    pass
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def _schedule(clock, delays):
+    call_later = clock.call_later
+    return [call_later(delay, _noop) for delay in delays]
+
+
+def _cancel(timers):
+    for timer in timers:
+        timer.cancel()
+
+
+def main():
+    """Print the per-timer cost of each operation."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    rand = random.Random(0)
+    delays = [rand.uniform(0, DAY) for _ in range(count)]
+
+    clock = TimeMachineClock()
+    schedule, timers = _timed(_schedule, clock, delays)
+    cancel, _ = _timed(_cancel, timers[::2])
+    fire, _ = _timed(clock.advance, DAY)
+
+    print('{} timers over {}s'.format(count, DAY))
+    for name, seconds, ops in [('schedule', schedule, count),
+                               ('cancel', cancel, count // 2),
+                               ('fire', fire, count - count // 2)]:
+        print('{:>10} {:>10.3f}s ({:.0f} ns/timer)'.format(
+            name, seconds, seconds / ops * 1e9))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,30 @@
 from time_travel.patchers.datetime_patcher import DatetimePatcher
 from time_travel.time_travel import TimeMachineClock
 
+import pickle
 import datetime
 from datetime import datetime as orig_datetime_class
 from .utils import _t
 
 
+# Real (not mocked) objects, created before the tests patch this module.
+REAL_DATETIME = datetime.datetime(2020, 1, 2, 3, 4, 5, 6)
+REAL_DATE = datetime.date(2020, 1, 2)
+
+
+class FixedOffset(datetime.tzinfo):
+    """A timezone with a fixed offset from UTC."""
+
+    def __init__(self, hours):
+        self._offset = datetime.timedelta(hours=hours)
+
+    def utcoffset(self, dt):
+        return self._offset
+
+    def dst(self, dt):
+        return datetime.timedelta(0)
+
+
 class TestDatetimePatcher(object):
 
     def setup_method(self, method):
@@ -47,3 +66,109 @@ class TestDatetimePatcher(object):
     def test_isinstance_works(self):
         assert isinstance(datetime.datetime.today(),
                           orig_datetime_class)
+
+    def test_date_today(self):
+        assert datetime.date.today() == \
+            datetime.date.fromtimestamp(_t(0))
+        assert type(datetime.date.today()) is datetime.date
+
+        self.clock.time = _t(86400)
+        assert datetime.date.today() == \
+            datetime.date.fromtimestamp(_t(86400))
+
+    def test_now_cached_per_clock_time(self):
+        now = datetime.datetime.now()
+        assert type(now) is datetime.datetime
+        assert datetime.datetime.now() is now
+
+        self.clock.time = _t(0.5)
+        assert datetime.datetime.now() is not now
+        assert datetime.datetime.now() == \
+            datetime.datetime.fromtimestamp(_t(0.5))
+
+    def test_inactive_patcher(self):
+        self.patcher.set_active(False)
+        try:
+            now = datetime.datetime.now()
+            assert type(now) is datetime.datetime
+            assert now != datetime.datetime.fromtimestamp(_t(0))
+            assert type(datetime.date.today()) is datetime.date
+        finally:
+            self.patcher.set_active(True)
+
+    def test_now_with_tz(self):
+        tz = FixedOffset(3)
+
+        now = datetime.datetime.now(tz)
+        assert type(now) is datetime.datetime
+        assert now == orig_datetime_class.fromtimestamp(_t(0), tz)
+        assert now.utcoffset() == datetime.timedelta(hours=3)
+        assert datetime.datetime.now(tz) is now
+
+        self.clock.time = _t(3600)
+        assert datetime.datetime.now(tz) == \
+            orig_datetime_class.fromtimestamp(_t(3600), tz)
+
+    def test_now_in_zones(self):
+        zones = [FixedOffset(hours) for hours in (-5, 0, 9)]
+
+        nows = datetime.datetime.now_in_zones(zones)
+
+        assert nows == [orig_datetime_class.fromtimestamp(_t(0), tz)
+                        for tz in zones]
+        assert [now.utcoffset().total_seconds() for now in nows] == \
+            [-5 * 3600, 0, 9 * 3600]
+
+    def test_isinstance_of_real_objects(self):
+        real_now = orig_datetime_class(2020, 1, 2)
+
+        assert isinstance(real_now, datetime.datetime)
+        assert isinstance(real_now, datetime.date)
+        assert isinstance(real_now.date(), datetime.date)
+        assert not isinstance(real_now.date(), datetime.datetime)
+        assert not isinstance(1, datetime.date)
+
+    def test_arithmetic_returns_mocked_objects(self):
+        now = datetime.datetime.now()
+        delta = datetime.timedelta(hours=1)
+
+        assert type(now + delta) is datetime.datetime
+        assert type(delta + now) is datetime.datetime
+        assert type(now - delta) is datetime.datetime
+        assert type(now - now) is datetime.timedelta
+        assert type(datetime.date.today() + delta) is datetime.date
+
+    def test_mocked_objects_have_no_dict(self):
+        assert not hasattr(datetime.datetime(2020, 1, 2), '__dict__')
+        assert not hasattr(datetime.date(2020, 1, 2), '__dict__')
+
+    def test_pickle_real_objects(self):
+        for real, mocked_class in [(REAL_DATETIME, datetime.datetime),
+                                   (REAL_DATE, datetime.date)]:
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                unpickled = pickle.loads(pickle.dumps(real, protocol))
+
+                assert unpickled == real
+                assert type(unpickled) is mocked_class
+
+    def test_pickle_keeps_tzinfo(self):
+        timezone = getattr(datetime, 'timezone', None)
+        if timezone is None:
+            return
+
+        real = REAL_DATETIME.replace(tzinfo=timezone.utc)
+        unpickled = pickle.loads(pickle.dumps(real, pickle.HIGHEST_PROTOCOL))
+
+        assert unpickled == real
+        assert unpickled.tzinfo is timezone.utc
+
+    def test_pickle_keeps_fold(self):
+        if not hasattr(REAL_DATETIME, 'fold'):
+            return
+
+        real = REAL_DATETIME.replace(fold=1)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            unpickled = pickle.loads(pickle.dumps(real, protocol))
+
+            assert unpickled.fold == 1
+            assert type(unpickled) is datetime.datetime
@@ -0,0 +1,297 @@
+from time_travel.event_pool import EventPool, CompactEventPool
+from .utils import _t
+
+import pytest
+
+
+class TestEventPool(object):
+
+    def setup_method(self, method):
+        """Create an empty event pool."""
+        self.event_pool = EventPool()
+
+    def test_empty_pool(self):
+        assert self.event_pool.get_next_event() == (None, [])
+        assert self.event_pool.get_events() == []
+
+    def test_next_event_is_earliest(self):
+        self.event_pool.add_future_event(_t(5), 'fd1', 'READ')
+        self.event_pool.add_future_event(_t(2), 'fd2', 'READ')
+        self.event_pool.add_future_event(_t(9), 'fd3', 'WRITE')
+
+        assert self.event_pool.get_next_event() == \
+            (_t(2), [('fd2', {'READ'})])
+
+    def test_next_event_with_predicate(self):
+        self.event_pool.add_future_event(_t(1), 'fd1', 'READ')
+        self.event_pool.add_future_event(_t(2), 'fd2', 'READ')
+        self.event_pool.add_future_event(_t(3), 'fd2', 'WRITE')
+
+        assert self.event_pool.get_next_event(
+            lambda fd, event: event == 'WRITE') == \
+            (_t(3), [('fd2', {'WRITE'})])
+
+        assert self.event_pool.get_next_event(
+            lambda fd, event: fd == 'fd3') == (None, [])
+
+    def test_events_are_sorted(self):
+        for rel in [7, 3, 11, 1, 5]:
+            self.event_pool.add_future_event(_t(rel), 'fd', rel)
+
+        assert [ts for ts, _ in self.event_pool.get_events()] == \
+            [_t(1), _t(3), _t(5), _t(7), _t(11)]
+
+    def test_removed_timestamp_added_again(self):
+        self.event_pool.add_future_event(_t(3), 'fd', 'READ')
+        self.event_pool.add_future_event(_t(4), 'fd', 'READ')
+        self.event_pool.remove_event_from_fd(_t(4), 'fd', 'READ')
+        self.event_pool.add_future_event(_t(4), 'fd', 'WRITE')
+
+        assert self.event_pool.get_events() == \
+            [(_t(3), [('fd', {'READ'})]), (_t(4), [('fd', {'WRITE'})])]
+
+    def test_set_time_drops_past_events(self):
+        self.event_pool.add_future_event(_t(1), 'fd', 'READ')
+        self.event_pool.add_future_event(_t(2), 'fd', 'READ')
+        self.event_pool.add_future_event(_t(3), 'fd', 'READ')
+
+        self.event_pool.set_time(_t(2))
+
+        assert [ts for ts, _ in self.event_pool.get_events()] == \
+            [_t(2), _t(3)]
+
+    def test_next_event_for_fds(self):
+        self.event_pool.add_future_event(_t(1), 'unwaited', 'READ')
+        self.event_pool.add_future_event(_t(2), 'fd1', 'WRITE')
+        self.event_pool.add_future_event(_t(3), 'fd1', 'READ')
+        self.event_pool.add_future_event(_t(3), 'fd2', 'READ')
+        self.event_pool.add_future_event(_t(3), 'unwaited', 'READ')
+
+        assert self.event_pool.get_next_event_for_fds(['fd1', 'fd2']) == \
+            (_t(2), [('fd1', {'WRITE'})])
+
+        ts, fd_events = self.event_pool.get_next_event_for_fds(
+            ['fd1', 'fd2'],
+            lambda fd, event: event == 'READ')
+        assert ts == _t(3)
+        assert sorted(fd_events) == [('fd1', {'READ'}), ('fd2', {'READ'})]
+
+        assert self.event_pool.get_next_event_for_fds(['fd3']) == (None, [])
+
+    def test_next_event_for_fds_after_removal(self):
+        self.event_pool.add_future_event(_t(1), 'fd', 'READ')
+        self.event_pool.add_future_event(_t(2), 'fd', 'READ')
+        self.event_pool.remove_event_from_fd(_t(1), 'fd', 'READ')
+
+        assert self.event_pool.get_next_event_for_fds(['fd']) == \
+            (_t(2), [('fd', {'READ'})])
+
+        self.event_pool.set_time(_t(3))
+
+        assert self.event_pool.get_next_event_for_fds(['fd']) == (None, [])
+
+    def test_set_time_without_expired_events(self):
+        self.event_pool.add_future_event(_t(5), 'fd', 'READ')
+
+        self.event_pool.set_time(_t(1))
+        self.event_pool.set_time(_t(5))
+
+        assert self.event_pool.get_events() == [(_t(5), [('fd', {'READ'})])]
+
+    def test_set_time_after_removal(self):
+        self.event_pool.add_future_event(_t(1), 'fd', 'READ')
+        self.event_pool.add_future_event(_t(2), 'fd', 'READ')
+        self.event_pool.add_future_event(_t(4), 'fd', 'READ')
+        self.event_pool.remove_event_from_fd(_t(2), 'fd', 'READ')
+
+        self.event_pool.set_time(_t(3))
+
+        assert self.event_pool.get_events() == [(_t(4), [('fd', {'READ'})])]
+        assert self.event_pool.get_next_event_for_fds(['fd']) == \
+            (_t(4), [('fd', {'READ'})])
+
+    def test_add_future_events(self):
+        self.event_pool.add_future_event(_t(2), 'fd1', 'READ')
+
+        self.event_pool.add_future_events([_t(3), _t(1), _t(2), _t(2)],
+                                          ['fd1', 'fd2', 'fd1', 'fd2'],
+                                          ['READ', 'WRITE', 'WRITE', 'READ'])
+
+        assert [(ts, sorted(fd_events)) for ts, fd_events in
+                self.event_pool.get_events()] == [
+            (_t(1), [('fd2', {'WRITE'})]),
+            (_t(2), [('fd1', {'READ', 'WRITE'}), ('fd2', {'READ'})]),
+            (_t(3), [('fd1', {'READ'})]),
+        ]
+
+        assert self.event_pool.get_next_event_for_fds(['fd1']) == \
+            (_t(2), [('fd1', {'READ', 'WRITE'})])
+
+    def test_add_future_events_length_mismatch(self):
+        with pytest.raises(ValueError):
+            self.event_pool.add_future_events([_t(1), _t(2)],
+                                              ['fd'],
+                                              ['READ', 'READ'])
+
+    def test_periodic_event_holds_one_occurrence(self):
+        self.event_pool.add_periodic_event(_t(1), 2, 'fd', 'READ')
+
+        assert self.event_pool.get_events() == [(_t(1), [('fd', {'READ'})])]
+
+        self.event_pool.remove_event_from_fd(_t(1), 'fd', 'READ')
+        assert self.event_pool.get_events() == [(_t(3), [('fd', {'READ'})])]
+
+        self.event_pool.remove_event_from_fd(_t(3), 'fd', 'READ')
+        assert self.event_pool.get_events() == [(_t(5), [('fd', {'READ'})])]
+
+    def test_periodic_event_skips_expired_occurrences(self):
+        self.event_pool.add_periodic_event(_t(1), 2, 'fd', 'READ')
+
+        self.event_pool.set_time(_t(8))
+        assert self.event_pool.get_events() == [(_t(9), [('fd', {'READ'})])]
+
+        self.event_pool.set_time(_t(11))
+        assert self.event_pool.get_events() == [(_t(11), [('fd', {'READ'})])]
+
+    def test_periodic_event_count(self):
+        self.event_pool.add_periodic_event(_t(1), 1, 'fd', 'READ', count=2)
+
+        self.event_pool.remove_event_from_fd(_t(1), 'fd', 'READ')
+        self.event_pool.remove_event_from_fd(_t(2), 'fd', 'READ')
+
+        assert self.event_pool.get_events() == []
+
+    def test_periodic_event_until(self):
+        self.event_pool.add_periodic_event(_t(1), 1, 'fd', 'READ',
+                                           until=_t(2))
+
+        self.event_pool.set_time(_t(1.5))
+        assert self.event_pool.get_events() == [(_t(2), [('fd', {'READ'})])]
+
+        self.event_pool.set_time(_t(2.5))
+        assert self.event_pool.get_events() == []
+
+    def test_get_next_event_until(self):
+        self.event_pool.add_future_event(_t(1), 'other', 'READ')
+        self.event_pool.add_future_event(_t(3), 'fd', 'READ')
+
+        def predicate(fd, event):
+            return fd == 'fd'
+
+        assert self.event_pool.get_next_event(predicate, until=_t(2)) == \
+            (None, [])
+        assert self.event_pool.get_next_event(predicate, until=_t(3)) == \
+            (_t(3), [('fd', {'READ'})])
+
+    def test_get_next_event_past_ordered_walk(self):
+        for index in range(EventPool.MAX_ORDERED_WALK * 2):
+            self.event_pool.add_future_event(_t(index), 'other', 'READ')
+        self.event_pool.add_future_event(_t(1000), 'fd', 'READ')
+        self.event_pool.add_future_event(_t(500), 'fd', 'WRITE')
+
+        def predicate(fd, event):
+            return fd == 'fd'
+
+        assert self.event_pool.get_next_event(predicate) == \
+            (_t(500), [('fd', {'WRITE'})])
+        assert self.event_pool.get_next_event(predicate, until=_t(400)) == \
+            (None, [])
+
+    def test_cancel_event(self):
+        handle = self.event_pool.add_future_event(_t(1), 'fd', 'READ')
+        self.event_pool.add_future_event(_t(2), 'fd', 'READ')
+
+        handle.cancel()
+        handle.cancel()
+
+        assert self.event_pool.get_next_event() == \
+            (_t(2), [('fd', {'READ'})])
+        assert self.event_pool.get_next_event_for_fds(['fd']) == \
+            (_t(2), [('fd', {'READ'})])
+        assert _t(1) not in self.event_pool._future_events
+
+    def test_cancel_event_that_occurred(self):
+        handle = self.event_pool.add_future_event(_t(1), 'fd', 'READ')
+        self.event_pool.remove_event_from_fd(_t(1), 'fd', 'READ')
+
+        handle.cancel()
+
+        self.event_pool.add_future_event(_t(1), 'fd', 'READ')
+        assert self.event_pool.get_next_event() == \
+            (_t(1), [('fd', {'READ'})])
+
+    def test_cancel_with_stale_handle(self):
+        handle = self.event_pool.add_future_event(_t(1), 'fd', 'READ')
+        self.event_pool.remove_event_from_fd(_t(1), 'fd', 'READ')
+        self.event_pool.add_future_event(_t(1), 'fd', 'READ')
+
+        handle.cancel()
+
+        assert self.event_pool.get_next_event() == \
+            (_t(1), [('fd', {'READ'})])
+
+    def test_cancel_event_added_twice(self):
+        handle = self.event_pool.add_future_event(_t(1), 'fd', 'READ')
+        assert self.event_pool.add_future_event(_t(1), 'fd', 'READ') is handle
+
+        handle.cancel()
+
+        assert self.event_pool.get_next_event() == (None, [])
+
+    def test_cancel_one_of_several_events(self):
+        self.event_pool.add_future_event(_t(1), 'fd', 'READ')
+        handle = self.event_pool.add_future_event(_t(1), 'fd', 'WRITE')
+
+        handle.cancel()
+
+        assert self.event_pool.get_events() == [(_t(1), [('fd', {'READ'})])]
+
+    def test_cancel_periodic_event(self):
+        series = self.event_pool.add_periodic_event(_t(1), 1, 'fd', 'READ')
+        self.event_pool.remove_event_from_fd(_t(1), 'fd', 'READ')
+
+        series.cancel()
+
+        assert self.event_pool.get_next_event() == (None, [])
+        assert self.event_pool.get_events() == []
+
+
+class TestCompactEventPool(TestEventPool):
+
+    def setup_method(self, method):
+        """Create an empty compact event pool."""
+        self.event_pool = CompactEventPool()
+
+    def test_compact_layout(self):
+        self.event_pool.add_future_event(_t(1), 'fd1', 'READ')
+        self.event_pool.add_future_event(_t(1), 'fd1', 'WRITE')
+        self.event_pool.add_future_event(_t(1), 'fd2', 'READ')
+
+        assert self.event_pool._future_events == {_t(1): ('fd1', 0b11,
+                                                          'fd2', 0b01)}
+
+    def test_remove_missing_event(self):
+        self.event_pool.add_future_event(_t(1), 'fd', 'READ')
+
+        with pytest.raises(KeyError):
+            self.event_pool.remove_event_from_fd(_t(1), 'fd', 'WRITE')
+
+    def test_many_fds_layout(self):
+        fds = ['fd{}'.format(index) for index in range(20)]
+        self.event_pool.add_future_events([_t(1)] * len(fds),
+                                          fds,
+                                          ['READ'] * len(fds))
+        self.event_pool.add_future_event(_t(1), 'fd3', 'WRITE')
+
+        expected = dict.fromkeys(fds, 0b01)
+        expected['fd3'] = 0b11
+        assert self.event_pool._future_events == {_t(1): expected}
+
+        assert self.event_pool.get_next_event_for_fds(['fd3']) == \
+            (_t(1), [('fd3', {'READ', 'WRITE'})])
+
+        for fd in fds:
+            self.event_pool.remove_event_from_fd(_t(1), fd, 'READ')
+        self.event_pool.remove_event_from_fd(_t(1), 'fd3', 'WRITE')
+
+        assert self.event_pool.get_events() == []
@@ -0,0 +1,54 @@
+from time_travel.patchers import registry
+from time_travel.patchers.time_patcher import TimePatcher
+
+import pytest
+
+
+def test_builtin_patchers():
+    names = registry.get_patcher_names()
+
+    assert {'datetime_patcher', 'select_patcher', 'time_patcher'} <= \
+        set(names)
+    assert registry.load_patcher('time_patcher') is TimePatcher
+    assert len(registry.load_patchers()) == len(names)
+
+
+def test_entry_points_read_once(monkeypatch):
+    calls = []
+
+    def _iter_entry_points():
+        calls.append(None)
+        return []
+
+    monkeypatch.setattr(registry, '_entry_points', None)
+    monkeypatch.setattr(registry, '_iter_entry_points', _iter_entry_points)
+
+    registry.get_patcher_names()
+    registry.get_patcher_names()
+
+    assert len(calls) == 1
+
+
+def test_load_patchers_by_name():
+    time_patchers = [TimePatcher]
+
+    assert registry.load_patchers(['time_patcher']) == time_patchers
+    assert registry.load_patchers(['time']) == time_patchers
+    assert registry.load_patchers('time') == time_patchers
+    assert registry.load_patchers(['time', 'time_patcher']) == time_patchers
+
+
+def test_load_patchers_by_namespace(monkeypatch):
+    monkeypatch.setitem(registry.BUILTIN_PATCHERS,
+                        'renamed_patcher',
+                        'time_travel.patchers.select_patcher:SelectPatcher')
+    monkeypatch.delitem(registry.BUILTIN_PATCHERS, 'select_patcher')
+
+    patchers = registry.load_patchers(['select'])
+    assert [patcher.get_events_namespace() for patcher in patchers] == \
+        ['select']
+
+
+def test_load_unknown_patcher():
+    with pytest.raises(ValueError):
+        registry.load_patchers(['no_such_patcher'])
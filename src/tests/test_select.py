@@ -168,3 +168,25 @@ class TestSelectPatcher(object):
         assert select.select([sock], [sock], [sock], 6) == \
             ([sock], [sock], [sock])
         assert self.clock.time == _t(1)
+
+    def test_earliest_event_across_lists(self):
+        sock1 = socket.socket()
+        sock2 = socket.socket()
+
+        self.event_pool.add_future_event(_t(2),
+                                         sock1,
+                                         SelectPatcher.EventTypes.WRITE)
+        self.event_pool.add_future_event(_t(1),
+                                         sock2,
+                                         SelectPatcher.EventTypes.READ)
+        self.event_pool.add_future_event(_t(1),
+                                         sock1,
+                                         'not a select event')
+
+        assert select.select([sock1, sock2], [sock1, sock2], [], 6) == \
+            ([sock2], [], [])
+        assert self.clock.time == _t(1)
+
+        assert select.select([sock1, sock2], [sock1, sock2], [], 6) == \
+            ([], [sock1], [])
+        assert self.clock.time == _t(2)
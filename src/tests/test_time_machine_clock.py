@@ -0,0 +1,154 @@
+from time_travel.time_machine_clock import TimeMachineClock
+from .utils import _t
+
+
+class RecordingListener(object):
+    """A listener that records the times it was notified of."""
+
+    def __init__(self):
+        self.times = []
+
+    def set_time(self, time):
+        self.times.append(time)
+
+
+class DeadlineListener(RecordingListener):
+    """A listener that is only interested in times from a deadline."""
+
+    def __init__(self, deadline):
+        super(DeadlineListener, self).__init__()
+        self.deadline = deadline
+
+    def bind_clock(self, clock):
+        clock.set_deadline(self, self.deadline)
+
+
+def test_listener_notified_on_every_change():
+    listener = RecordingListener()
+    clock = TimeMachineClock(clock_listeners=[listener])
+
+    clock.time = _t(1)
+    clock.time = _t(2)
+
+    assert listener.times == [_t(1), _t(2)]
+
+
+def test_listener_notified_from_deadline():
+    listener = DeadlineListener(_t(10))
+    clock = TimeMachineClock(clock_listeners=[listener])
+
+    clock.time = _t(5)
+    clock.time += 5
+    clock.time += 1
+
+    assert listener.times == [_t(10), _t(11)]
+
+
+def test_listeners_with_different_deadlines():
+    early_listener = DeadlineListener(_t(3))
+    late_listener = DeadlineListener(_t(7))
+    clock = TimeMachineClock(clock_listeners=[early_listener, late_listener])
+
+    clock.time = _t(5)
+    clock.set_deadline(early_listener, float('inf'))
+    clock.time = _t(8)
+
+    assert early_listener.times == [_t(5)]
+    assert late_listener.times == [_t(8)]
+
+
+def test_time_ns():
+    clock = TimeMachineClock()
+    assert clock.time_ns == int(_t(0)) * 10 ** 9
+
+    clock.time_ns += 1500
+    assert clock.time_ns == int(_t(0)) * 10 ** 9 + 1500
+    assert clock.time == _t(0.0000015)
+
+    clock.time = _t(0.25)
+    assert clock.time_ns == int(_t(0)) * 10 ** 9 + 250000000
+
+
+def test_advance_does_not_accumulate_errors():
+    clock = TimeMachineClock()
+
+    for _ in range(1000000):
+        clock.advance(0.000001)
+
+    assert clock.time == _t(1)
+    assert clock.time_ns == int(_t(1)) * 10 ** 9
+
+
+def test_advance_notifies_listeners():
+    listener = RecordingListener()
+    clock = TimeMachineClock(clock_listeners=[listener])
+
+    clock.advance(0.5)
+
+    assert listener.times == [_t(0.5)]
+
+
+def test_call_later_in_order():
+    clock = TimeMachineClock()
+    calls = []
+
+    clock.call_later(3, lambda: calls.append(('c', clock.time)))
+    clock.call_later(1, lambda: calls.append(('a', clock.time)))
+    clock.call_at(_t(2), lambda: calls.append(('b', clock.time)))
+    clock.call_later(10, lambda: calls.append(('d', clock.time)))
+
+    clock.time = _t(5)
+
+    assert calls == [('a', _t(1)), ('b', _t(2)), ('c', _t(3))]
+    assert clock.time == _t(5)
+
+
+def test_call_later_arguments_and_cancel():
+    clock = TimeMachineClock()
+    calls = []
+
+    clock.call_later(1, calls.append, 'called')
+    clock.call_later(1, calls.append, 'cancelled').cancel()
+
+    clock.advance(1)
+
+    assert calls == ['called']
+
+
+def test_call_later_far_in_the_future():
+    clock = TimeMachineClock()
+    calls = []
+
+    clock.call_later(86400 * 365, calls.append, 'a year')
+
+    clock.time += 86400 * 364
+    assert calls == []
+
+    clock.time += 86400
+    assert calls == ['a year']
+
+
+def test_timer_listeners_see_timer_time():
+    listener = RecordingListener()
+    clock = TimeMachineClock(clock_listeners=[listener])
+
+    clock.call_later(1, lambda: None)
+    clock.time = _t(2)
+
+    assert listener.times == [_t(1), _t(2)]
+
+
+def test_timer_moving_the_clock():
+    clock = TimeMachineClock()
+    calls = []
+
+    def _sleep():
+        clock.time += 5
+
+    clock.call_later(1, _sleep)
+    clock.call_later(4, lambda: calls.append(clock.time))
+
+    clock.time = _t(2)
+
+    assert calls == [_t(4)]
+    assert clock.time == _t(6)
@@ -3,6 +3,7 @@ from time_travel.time_travel import TimeMachineClock
 from .utils import _t
 
 import time
+import pytest
 
 
 class TestTimePatcher(object):
@@ -40,3 +41,57 @@ class TestTimePatcher(object):
         self.patcher.stop()
 
         assert time.time() != _t(0)
+
+    @pytest.mark.skipif(not hasattr(time, 'time_ns'),
+                        reason='time.time_ns is not supported in this version')
+    def test_time_ns_patch(self):
+        assert time.time_ns() == int(_t(0)) * 10 ** 9
+        assert time.monotonic_ns() == int(_t(0)) * 10 ** 9
+        assert time.perf_counter_ns() == int(_t(0)) * 10 ** 9
+
+        time.sleep(0.000001)
+        assert time.time_ns() == int(_t(0)) * 10 ** 9 + 1000
+
+    def test_monotonic_clocks_patch(self):
+        assert time.monotonic() == _t(0)
+        assert time.perf_counter() == _t(0)
+        assert time.process_time() == _t(0)
+
+        time.sleep(5)
+
+        assert time.monotonic() == _t(5)
+        assert time.perf_counter() == _t(5)
+        assert time.process_time() == _t(5)
+
+    def test_get_clock_info_patch(self):
+        info = time.get_clock_info('monotonic')
+
+        assert info.implementation == 'time_travel'
+        assert info.monotonic
+        assert info.resolution == 1e-09
+
+        with pytest.raises(ValueError):
+            time.get_clock_info('no_such_clock')
+
+    def test_localtime_and_gmtime_patch(self):
+        assert time.localtime() == time.localtime(_t(0))
+        assert time.gmtime() == time.gmtime(_t(0))
+
+        time.sleep(3600.5)
+
+        assert time.localtime() == time.localtime(_t(3600))
+        assert time.gmtime() == time.gmtime(_t(3600))
+        assert time.gmtime().tm_hour == 1
+
+    def test_time_strings_patch(self):
+        assert time.ctime() == time.ctime(_t(0))
+        assert time.asctime() == time.asctime(time.localtime(_t(0)))
+        assert time.strftime('%Y-%m-%d %H:%M:%S') == \
+            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(_t(0)))
+
+        self.clock.time = _t(86400 * 365)
+
+        assert time.ctime() == time.ctime(_t(86400 * 365))
+        assert time.strftime('%Y') == '1971'
+        assert time.strftime('%d') == \
+            time.strftime('%d', time.localtime(_t(86400 * 365)))
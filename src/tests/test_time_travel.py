@@ -1,7 +1,11 @@
 from time_travel import TimeTravel
 from .utils import _t
 
+import sys
 import time
+import array
+import threading
+import types
 import select
 import pytest
 import socket
@@ -140,3 +144,338 @@ def test_epoll():
         now = t.clock.time
         assert poll.poll() == [(sock, select.POLLIN)]
         assert time.time() == now + 2
+
+
+def test_add_future_events():
+    with TimeTravel(modules_to_patch=__name__) as t:
+        sock1 = socket.socket()
+        sock2 = socket.socket()
+
+        t.add_future_events([2, 3],
+                            [sock1, sock2],
+                            [t.event_types.select.READ,
+                             t.event_types.select.WRITE])
+
+        now = t.clock.time
+        assert select.select([sock1], [sock2], []) == ([sock1], [], [])
+        assert time.time() == now + 2
+        assert select.select([sock1], [sock2], []) == ([], [sock2], [])
+        assert time.time() == now + 3
+
+
+def test_add_future_events_from_array():
+    with TimeTravel(modules_to_patch=__name__) as t:
+        sock = socket.socket()
+
+        t.add_future_events(array.array('d', [1.5, 2.5]),
+                            [sock, sock],
+                            [t.event_types.select.READ,
+                             t.event_types.select.WRITE])
+
+        now = t.clock.time
+        assert select.select([sock], [], []) == ([sock], [], [])
+        assert time.time() == now + 1.5
+        assert select.select([], [sock], []) == ([], [sock], [])
+        assert time.time() == now + 2.5
+
+
+def test_add_periodic_event():
+    with TimeTravel(modules_to_patch=__name__) as t:
+        sock = socket.socket()
+
+        t.add_periodic_event(0.25, sock, t.event_types.select.READ, count=3)
+
+        now = t.clock.time
+        for occurrence in range(1, 4):
+            assert select.select([sock], [], []) == ([sock], [], [])
+            assert time.time() == now + occurrence * 0.25
+
+        assert select.select([sock], [], [], 1) == ([], [], [])
+
+
+def test_cancel_future_event():
+    with TimeTravel(modules_to_patch=__name__) as t:
+        sock = socket.socket()
+
+        handle = t.add_future_event(2, sock, t.event_types.select.READ)
+        handle.cancel()
+
+        now = t.clock.time
+        assert select.select([sock], [], [], 5) == ([], [], [])
+        assert time.time() == now + 5
+
+
+def test_compact_events():
+    with TimeTravel(compact_events=True, modules_to_patch=__name__) as t:
+        sock = socket.socket()
+
+        t.add_future_event(2, sock, t.event_types.select.READ)
+        t.add_future_event(2, sock, t.event_types.select.WRITE)
+
+        now = t.clock.time
+        assert select.select([sock], [sock], []) == ([sock], [sock], [])
+        assert time.time() == now + 2
+
+
+def test_run_until():
+    t = TimeTravel()
+    calls = []
+
+    def handler(fd, event):
+        calls.append((t.clock.time, fd, event))
+        if t.clock.time < _t(4):
+            t.add_future_event(1, fd, event)
+
+    t.set_event_handler('fd', handler)
+    t.add_future_event(2, 'fd', 'READ')
+    t.add_future_event(3, 'other', 'READ')
+    t.clock.call_later(2.5, calls.append, 'callback')
+
+    assert t.run_until(_t(10)) == 3
+    assert calls == [(_t(2), 'fd', 'READ'),
+                     'callback',
+                     (_t(3), 'fd', 'READ'),
+                     (_t(4), 'fd', 'READ')]
+    assert t.clock.time == _t(10)
+
+
+def test_run_until_limit():
+    t = TimeTravel()
+    calls = []
+
+    t.set_event_handler('fd', lambda fd, event: calls.append(t.clock.time))
+    t.add_future_event(2, 'fd', 'READ')
+    t.add_future_event(5, 'fd', 'READ')
+
+    assert t.run_until(_t(3)) == 1
+    assert calls == [_t(2)]
+    assert t.clock.time == _t(3)
+
+    t.remove_event_handler('fd')
+    assert t.run_until(_t(6)) == 0
+    assert calls == [_t(2)]
+
+
+def test_run_until_idle():
+    t = TimeTravel()
+    calls = []
+
+    def callback():
+        t.add_future_event(1, 'fd', 'WRITE')
+
+    t.set_event_handler('fd', lambda fd, event: calls.append(
+        (t.clock.time, event)))
+    t.add_periodic_event(1, 'fd', 'READ', count=2)
+    t.clock.call_later(5, callback)
+
+    assert t.run_until_idle() == 3
+    assert calls == [(_t(1), 'READ'), (_t(2), 'READ'), (_t(6), 'WRITE')]
+    assert t.clock.time == _t(6)
+
+
+def test_patching_changed_module():
+    module = types.ModuleType('time_travel_test_module')
+    module.get_time = time.time
+    sys.modules[module.__name__] = module
+
+    try:
+        for _ in range(2):
+            with TimeTravel(modules_to_patch=module.__name__):
+                assert module.get_time() == _t(0)
+
+            assert module.get_time() != _t(0)
+
+        module.sleep = time.sleep
+
+        with TimeTravel(modules_to_patch=module.__name__):
+            assert module.get_time() == _t(0)
+            module.sleep(5)
+            assert module.get_time() == _t(5)
+    finally:
+        del sys.modules[module.__name__]
+
+
+def test_patching_rebound_attribute():
+    module = types.ModuleType('time_travel_test_module')
+    module.clock = None
+    sys.modules[module.__name__] = module
+
+    try:
+        with TimeTravel(modules_to_patch=module.__name__):
+            assert module.clock is None
+
+        module.clock = time.time
+
+        with TimeTravel(modules_to_patch=module.__name__):
+            assert module.clock() == _t(0)
+
+        assert module.clock is time.time
+    finally:
+        del sys.modules[module.__name__]
+
+
+def test_patching_all_modules():
+    module = types.ModuleType('time_travel_test_module')
+    module.get_time = time.time
+    module.datetime = datetime
+    sys.modules[module.__name__] = module
+
+    try:
+        with TimeTravel():
+            assert module.get_time() == _t(0)
+            assert module.datetime.now() == datetime.fromtimestamp(_t(0))
+
+        assert module.get_time() != _t(0)
+        assert module.datetime is datetime
+    finally:
+        del sys.modules[module.__name__]
+
+
+def test_patch_imports(tmpdir):
+    tmpdir.join('time_travel_imported.py').write(
+        'from time import time, sleep\n')
+    sys.path.insert(0, str(tmpdir))
+
+    try:
+        with TimeTravel(patch_imports=True):
+            import time_travel_imported
+
+            assert time_travel_imported.time() == _t(0)
+            time_travel_imported.sleep(5)
+            assert time_travel_imported.time() == _t(5)
+
+        assert time_travel_imported.time is time.time
+        assert time_travel_imported.sleep is time.sleep
+    finally:
+        sys.path.remove(str(tmpdir))
+        sys.modules.pop('time_travel_imported', None)
+
+
+def test_patch_imports_restores_skipped_modules(tmpdir):
+    tmpdir.join('time_travel_imported.py').write('from time import time\n')
+    sys.path.insert(0, str(tmpdir))
+
+    try:
+        with TimeTravel(patch_imports=True,
+                        modules_to_skip=['time_travel_imported']):
+            import time_travel_imported
+
+        assert time_travel_imported.time is time.time
+    finally:
+        sys.path.remove(str(tmpdir))
+        sys.modules.pop('time_travel_imported', None)
+
+
+def test_nested_patch_imports(tmpdir):
+    tmpdir.join('time_travel_imported.py').write('from time import time\n')
+    sys.path.insert(0, str(tmpdir))
+
+    try:
+        with TimeTravel(patch_imports=True, patchers=['datetime']):
+            with TimeTravel(patch_imports=True, patchers=['time']):
+                import time_travel_imported
+
+                assert time_travel_imported.time() == _t(0)
+    finally:
+        sys.path.remove(str(tmpdir))
+        sys.modules.pop('time_travel_imported', None)
+
+
+def test_patch_imports_by_pattern(tmpdir):
+    for name in ['time_travel_imported_app', 'time_travel_imported_other']:
+        tmpdir.join(name + '.py').write('from time import time\n')
+    sys.path.insert(0, str(tmpdir))
+
+    try:
+        with TimeTravel(patch_imports=True,
+                        modules_to_patch=['time_travel_imported_app*']):
+            import time_travel_imported_app
+            import time_travel_imported_other
+
+            assert time_travel_imported_app.time() == _t(0)
+
+        assert time_travel_imported_app.time is time.time
+        assert time_travel_imported_other.time is time.time
+    finally:
+        sys.path.remove(str(tmpdir))
+        sys.modules.pop('time_travel_imported_app', None)
+        sys.modules.pop('time_travel_imported_other', None)
+
+
+def test_armed():
+    real_time = time.time
+
+    TimeTravel.arm(modules_to_patch=__name__)
+    try:
+        assert time.time is not real_time
+        assert time.time() != _t(0)
+        assert datetime.now() != datetime.fromtimestamp(_t(0))
+
+        for _ in range(2):
+            with TimeTravel() as t:
+                sock = socket.socket()
+                t.add_future_event(2, sock, t.event_types.select.READ)
+
+                assert time.time() == _t(0)
+                assert select.select([sock], [], []) == ([sock], [], [])
+                assert time.time() == _t(2)
+                assert datetime.now() == datetime.fromtimestamp(_t(2))
+
+            assert time.time() != _t(2)
+            assert datetime.now() != datetime.fromtimestamp(_t(2))
+    finally:
+        TimeTravel.disarm()
+
+    assert time.time is real_time
+
+
+def test_selected_patchers():
+    with TimeTravel(patchers=['time'], modules_to_patch=__name__) as t:
+        assert time.time() == _t(0)
+        assert datetime.now() != datetime.fromtimestamp(_t(0))
+        assert not hasattr(t.event_types, 'select')
+
+
+@pytest.fixture
+def pattern_modules():
+    modules = {}
+    for name in ['time_travel_app',
+                 'time_travel_app.client',
+                 'time_travel_app.vendor',
+                 'time_travel_other']:
+        module = types.ModuleType(name)
+        module.get_time = time.time
+        sys.modules[name] = modules[name] = module
+
+    yield modules
+
+    for name in modules:
+        del sys.modules[name]
+
+
+def test_patch_modules_by_pattern(pattern_modules):
+    with TimeTravel(modules_to_patch=['time_travel_app*'],
+                    modules_to_skip='time_travel_app.vendor'):
+        patched = sorted(name for name, module in pattern_modules.items()
+                         if module.get_time() == _t(0))
+
+    assert patched == ['time_travel_app', 'time_travel_app.client']
+
+
+def test_skip_modules_by_pattern(pattern_modules):
+    with TimeTravel(modules_to_skip=['time_travel_app.*']):
+        patched = sorted(name for name, module in pattern_modules.items()
+                         if module.get_time() == _t(0))
+
+    assert patched == ['time_travel_app', 'time_travel_other']
+
+
+def test_patterns_leave_unpatched_modules(pattern_modules):
+    real_threading_time = threading._time
+
+    with TimeTravel(patchers=['time'], modules_to_patch=['*']):
+        assert pattern_modules['time_travel_other'].get_time() == _t(0)
+        assert threading._time is real_threading_time
+        assert time.localtime() == time.localtime(_t(0))
+
+    assert threading._time is real_threading_time
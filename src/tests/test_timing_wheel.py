@@ -0,0 +1,69 @@
+from time_travel.timing_wheel import TimingWheel
+
+import random
+
+
+def _pop_all(wheel, limit_ns):
+    out = []
+    while True:
+        timer = wheel.pop_due(limit_ns)
+        if timer is None:
+            return out
+        out.append(timer.when_ns)
+
+
+def test_timers_popped_in_order():
+    wheel = TimingWheel(0, resolution_ns=10, bits=2, levels=2)
+    rand = random.Random(0)
+
+    # Spread over the wheel's levels and its overflow.
+    times = [rand.randrange(1000) for _ in range(300)]
+    for when_ns in times:
+        wheel.add(when_ns, None)
+
+    assert _pop_all(wheel, 499) == sorted(t for t in times if t <= 499)
+    assert _pop_all(wheel, 1000) == sorted(t for t in times if t > 499)
+    assert len(wheel) == 0
+
+
+def test_cancelled_timers_not_popped():
+    wheel = TimingWheel(0, resolution_ns=10, bits=2, levels=2)
+
+    timers = [wheel.add(when_ns, None) for when_ns in range(0, 500, 5)]
+    for timer in timers[::2]:
+        timer.cancel()
+        timer.cancel()
+
+    assert len(wheel) == 50
+    assert _pop_all(wheel, 1000) == list(range(5, 500, 10))
+
+
+def test_timer_added_while_moving():
+    wheel = TimingWheel(0, resolution_ns=10, bits=2, levels=2)
+
+    wheel.add(300, None)
+    assert _pop_all(wheel, 100) == []
+
+    wheel.add(150, None)
+    wheel.add(100, None)
+    assert _pop_all(wheel, 300) == [100, 150, 300]
+
+
+def test_rewind():
+    wheel = TimingWheel(0, resolution_ns=10, bits=2, levels=2)
+
+    wheel.add(900, None)
+    assert _pop_all(wheel, 500) == []
+
+    wheel.rewind(100)
+    wheel.add(200, None)
+
+    assert _pop_all(wheel, 1000) == [200, 900]
+
+
+def test_deadline():
+    wheel = TimingWheel(0, resolution_ns=10, bits=2, levels=2)
+    assert wheel.get_deadline_ns() is None
+
+    wheel.add(57, None)
+    assert wheel.get_deadline_ns() <= 57
@@ -0,0 +1,111 @@
+"""Patchers that stay installed between time-travel contexts."""
+
+from .patchers.base_patcher import ImportHook, start_patchers
+
+
+class ArmedPatchers(object):
+    """Patchers whose fakes are installed once, for a whole test session.
+
+    The patchers are given switches instead of a clock and an event pool, and
+    their fake functions are wrapped by trampolines. While no `TimeTravel` is
+    active the trampolines call the real functions, so entering and leaving a
+    `TimeTravel` context only switches the active clock and event pool.
+    """
+
+    def __init__(self, patcher_classes, patch_imports=False, **kwargs):
+        """Create the patchers (see `TimeTravel.arm`)."""
+        self.clock = _Switch()
+        self.event_pool = _Switch()
+        self.active = None
+
+        self.patches = [patcher(clock=self.clock,
+                                event_pool=self.event_pool,
+                                **kwargs)
+                        for patcher in patcher_classes]
+
+        for patcher in self.patches:
+            patcher.get_patch_actions = self._with_trampolines(
+                patcher.get_patch_actions)
+            patcher.set_active(False)
+
+        self._patch_imports = patch_imports
+        self._import_hook = None
+
+    def start(self):
+        """Install the fakes."""
+        start_patchers(self.patches)
+
+        if self._patch_imports:
+            self._import_hook = ImportHook(self.patches)
+            self._import_hook.install()
+
+    def stop(self):
+        """Restore the real objects."""
+        if self._import_hook is not None:
+            self._import_hook.uninstall()
+            self._import_hook = None
+
+        for patcher in self.patches:
+            patcher.stop()
+
+    def activate(self, time_travel):
+        """Make the fakes use the clock and event pool of `time_travel`.
+
+        - time_travel: A `TimeTravel`, or None to make the fakes call the real
+                       objects.
+
+        Return the previously active `TimeTravel` (or None).
+        """
+        previous = self.active
+
+        self.active = time_travel
+        if time_travel is None:
+            self.clock.target = self.event_pool.target = None
+        else:
+            self.clock.target = time_travel.clock
+            self.event_pool.target = time_travel.event_pool
+
+        if (previous is None) != (time_travel is None):
+            for patcher in self.patches:
+                patcher.set_active(time_travel is not None)
+
+        return previous
+
+    def _with_trampolines(self, get_patch_actions):
+        def _get_patch_actions():
+            return [(name,
+                     real,
+                     fake if isinstance(fake, type)
+                     else _trampoline(self, real, fake))
+                    for name, real, fake in get_patch_actions()]
+
+        return _get_patch_actions
+
+
+class _Switch(object):
+    """Forwards attribute access to its target (the active clock or pool)."""
+
+    def __init__(self):
+        object.__setattr__(self, 'target', None)
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+    def __setattr__(self, name, value):
+        if name == 'target':
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.target, name, value)
+
+
+def _trampoline(armed, real, fake):
+    """Return a function calling `fake` while armed is active, else `real`."""
+    def trampoline(*args, **kwargs):
+        if armed.active is None:
+            return real(*args, **kwargs)
+
+        return fake(*args, **kwargs)
+
+    trampoline.__name__ = getattr(real, '__name__', trampoline.__name__)
+    trampoline.__doc__ = getattr(real, '__doc__', None)
+    return trampoline
@@ -1,5 +1,10 @@
 """A utility class that holds I/O events and their expiration time."""
 
+import collections
+import math
+import heapq
+import weakref
+
 
 class EventPool(object):
     """A pool that holds I/O events and their expiration time.
@@ -11,11 +16,60 @@ class EventPool(object):
 
     The descriptors are held in a dictionary with the following format:
       self._future_events = {timestamp: {fd: set(event, ...), ...}}
+
+    The timestamps are also kept in a heap (`self._timestamps`) so the pool
+    can be walked in chronological order without sorting it, and per fd (in
+    `self._fd_timestamps = {fd: [timestamp, ...]}`, a heap for each fd) so
+    queries for a given set of fds only look at those fds' timestamps.
+    Timestamps that were removed from `_future_events` are dropped from the
+    heaps lazily.
+
+    Periodic events only have their next occurrence in the pool. The series
+    it belongs to is kept in `self._periodic_events`:
+      self._periodic_events = {(timestamp, fd, event): [series, ...]}
+    and the following occurrence is added once it is removed or expired.
+
+    Cancelled events are kept in `self._cancelled` as (timestamp, fd, event)
+    tuples and are ignored by the queries. They are only removed from the pool
+    once they get to its front (or expire). The handles of the events in the
+    pool are kept (weakly) in `self._handles`:
+      self._handles = {(timestamp, fd, event): handle}
+    so a handle whose event was removed can't cancel the same event when it is
+    added again.
+
+    When bound to a clock, the pool sets its clock deadline to its earliest
+    timestamp, so the clock only notifies it of changes that can expire events.
+
+    The values of `_future_events` (the events of a single timestamp) are only
+    accessed through the `_*_bucket*` methods, so subclasses can store them in
+    a different layout (see `CompactEventPool`).
     """
 
+    # The number of timestamps `get_next_event` walks in chronological order
+    # before filtering the whole pool.
+    MAX_ORDERED_WALK = 64
+
     def __init__(self):
         """Initialize the event pool."""
         self._future_events = {}
+        self._timestamps = []
+        self._fd_timestamps = {}
+        self._periodic_events = {}
+        self._cancelled = set()
+        self._handles = weakref.WeakValueDictionary()
+
+        self._clock = None
+        self._deadline = None
+
+    def bind_clock(self, clock):
+        """Register the clock that the pool listens to.
+
+        The clock is only asked to notify the pool when the time gets to the
+        pool's earliest timestamp.
+        """
+        self._clock = clock
+        self._deadline = None
+        self._update_deadline()
 
     def add_future_event(self, timestamp, fd, event):
         """Add an event to a given timestamp.
@@ -24,10 +78,114 @@ class EventPool(object):
         - fd: Any object that an I/O function (select, poll, etc.) will be
               waiting on.
         - event: Any object that the relevant patcher can filter the event by.
+
+        Return an `EventHandle` that can cancel the event. Adding an event
+        that is already in the pool returns its existing handle.
         """
-        ts_dict = self._future_events.setdefault(timestamp, dict())
-        fd_set = ts_dict.setdefault(fd, set())
-        fd_set.add(event)
+        return self._add_event(timestamp, fd, event)
+
+    def _add_event(self, timestamp, fd, event, handle=None):
+        """Add an event to a given timestamp and register its handle.
+
+        A new handle is created if `handle` is None and the event has no
+        (uncancelled) handle yet.
+        """
+        key = (timestamp, fd, event)
+
+        if self._cancelled:
+            self._cancelled.discard(key)
+
+        new_timestamp, new_fd = self._add_to_bucket(timestamp, fd, event)
+
+        if new_timestamp:
+            heapq.heappush(self._timestamps, timestamp)
+            self._update_deadline()
+
+        if new_fd:
+            heapq.heappush(self._fd_timestamps.setdefault(fd, []), timestamp)
+
+        if handle is None:
+            handle = self._handles.get(key)
+            if handle is None or handle.cancelled:
+                handle = self._handles[key] = EventHandle(self, timestamp, fd,
+                                                          event)
+        else:
+            self._handles[key] = handle
+
+        return handle
+
+    def add_future_events(self, timestamps, fds, events):
+        """Add many events at once.
+
+        - timestamps: Times in seconds since the epoch.
+        - fds: The fds the events will happen for.
+        - events: The events that will happen.
+
+        The arguments are parallel sequences (lists, tuples, or arrays with a
+        `tolist` method such as NumPy arrays) - the i'th event is
+        (timestamps[i], fds[i], events[i]).
+
+        The events are inserted in a single pass without a method call per
+        event, and the heaps are rebuilt once at the end instead of being
+        pushed to for every event.
+
+        Adding millions of events allocates millions of dicts and sets, which
+        the garbage collector keeps rescanning while they are allocated. A
+        caller adding that many can pause it around the call (`gc.disable()`),
+        the pool's dicts and sets can't form reference cycles.
+        """
+        timestamps, fds, events = [_to_list(column) for column in
+                                   (timestamps, fds, events)]
+
+        if not len(timestamps) == len(fds) == len(events):
+            raise ValueError('timestamps, fds and events must be of the same '
+                             'length ({}, {} and {} given)'.format(
+                                 len(timestamps), len(fds), len(events)))
+
+        new_timestamps, new_fd_timestamps = self._add_to_buckets(timestamps,
+                                                                 fds,
+                                                                 events)
+
+        if self._cancelled:
+            self._cancelled.difference_update(zip(timestamps, fds, events))
+
+        _extend_heap(self._timestamps, new_timestamps)
+        self._update_deadline()
+
+        for fd, fd_timestamps in new_fd_timestamps.items():
+            heap = self._fd_timestamps.get(fd)
+            if heap is None:
+                fd_timestamps.sort()
+                self._fd_timestamps[fd] = fd_timestamps
+            else:
+                _extend_heap(heap, fd_timestamps)
+
+    def add_periodic_event(self, timestamp, interval, fd, event,
+                           until=None, count=None):
+        """Add an event that recurs every `interval` seconds.
+
+        - timestamp: Time of the first occurrence in seconds since the epoch.
+        - interval: Seconds between occurrences.
+        - fd: The fd the event will happen for.
+        - event: The event that will happen.
+        - until: Time in seconds since the epoch after which the event stops
+                 recurring (unlimited if None).
+        - count: Number of occurrences (unlimited if None).
+
+        Only the next occurrence is held in the pool at any time, so a series
+        costs the same however long it runs.
+
+        Return a `PeriodicEvent` handle that can cancel the series.
+        """
+        if interval <= 0:
+            raise ValueError('interval must be positive ({} given)'.
+                             format(interval))
+
+        series = PeriodicEvent(self, timestamp, interval, fd, event,
+                               until, count)
+        self._add_occurrence(series, 0)
+
+        return series
 
     def get_events(self, predicate=None):
         """Return a list of all added events sorted by timestamp.
@@ -38,36 +196,87 @@ class EventPool(object):
         The returned list is in the following format (and sorted by timestamp):
           [(timestamp, [(fd, set(events)), ...]), ...]
         """
-        predicate = (lambda fd, evt: True) if predicate is None else predicate
+        filtered_events = []
+        for timestamp in self._iter_timestamps():
+            filtered_events_for_ts = self._filter(timestamp, predicate)
+            if filtered_events_for_ts:
+                filtered_events.append((timestamp, filtered_events_for_ts))
+
+        return filtered_events
+
+    def get_next_event(self, predicate=None, until=None):
+        """Return the next event to occur.
+
+        - predicate: A condition to filter the fds and events by.
+        - until: Ignore the events after this time (no limit if None).
+
+        The returned evens it a tuple of (timestamp, [(fd, set(events)), ...]).
+
+        The pool is walked in chronological order and the walk stops at the
+        first timestamp that has events matching the predicate. If none of the
+        first `MAX_ORDERED_WALK` timestamps match, the rest of the pool is
+        filtered as a whole instead, which is cheaper than walking it in order.
+        """
+        self._drop_cancelled_events()
 
-        def _filter(_ts_dict):
-            """Return fd and events subset matching to the predicate."""
-            out = []
+        for walked, timestamp in enumerate(self._iter_timestamps()):
+            if until is not None and timestamp > until:
+                return None, []
 
-            for fd, event_set in _ts_dict.items():
-                out_events = {event for event in event_set if
-                              predicate(fd, event)}
+            if walked == self.MAX_ORDERED_WALK:
+                break
 
-                if out_events:
-                    out.append((fd, out_events))
+            fd_events = self._filter(timestamp, predicate)
+            if fd_events:
+                return timestamp, fd_events
+        else:
+            return None, []
 
-            return out
+        timestamp = self._get_first_matching_timestamp(predicate, until)
+        if timestamp is None:
+            return None, []
 
-        filtered_events = []
-        for timestamp, ts_dict in self._future_events.items():
-            filtered_events_for_ts = _filter(ts_dict)
-            if filtered_events_for_ts:
-                filtered_events.append((timestamp, filtered_events_for_ts))
+        return timestamp, self._filter(timestamp, predicate)
 
-        return sorted(filtered_events, key=lambda x: x[0])
+    def get_next_event_for_fds(self, fds, predicate=None):
+        """Return the next event to occur for any of the given fds.
 
-    def get_next_event(self, predicate=None):
-        """Return the next event to occur.
+        - fds: An iterable of the fds that are waited on.
+        - predicate: A condition to filter the events by. The predicate will
+                     be checked on the (fd, event) tuple of the given fds only.
+
+        Only the given fds' timestamps are looked at, so the cost depends on
+        the number of waited fds and not on the size of the pool.
 
         The returned evens it a tuple of (timestamp, [(fd, set(events)), ...]).
         """
-        events = self.get_events(predicate)
-        return (None, []) if not events else events[0]
+        self._drop_cancelled_events()
+
+        fds = set(fds)
+
+        next_timestamp = None
+        for fd in fds:
+            timestamp = self._get_next_timestamp_for_fd(fd,
+                                                        predicate,
+                                                        next_timestamp)
+            if timestamp is not None:
+                next_timestamp = timestamp
+
+        if next_timestamp is None:
+            return None, []
+
+        fd_events = []
+        for fd in fds:
+            event_set = self._get_bucket_events(next_timestamp, fd)
+            if not event_set:
+                continue
+
+            event_set = self._live_events(next_timestamp, fd, event_set,
+                                          predicate)
+            if event_set:
+                fd_events.append((fd, event_set))
+
+        return next_timestamp, fd_events
 
     def set_time(self, timestamp):
         """Remove all events before the given timestamp.
@@ -77,9 +286,42 @@ class EventPool(object):
         This method ia a callback function for `time_machine_clock` changes.
         After the time has changed, the pool can throw away older events that
         had already satisfied.
+
+        Only the expired timestamps are touched, so when no event has expired
+        this costs a single comparison.
         """
-        self._future_events = {k: v for k, v in self._future_events.items()
-                               if k >= timestamp}
+        heap = self._timestamps
+
+        if not heap or heap[0] >= timestamp:
+            return
+
+        expired_series = []
+        while heap and heap[0] < timestamp:
+            expired_timestamp = heapq.heappop(heap)
+            expired_events = self._pop_bucket(expired_timestamp)
+
+            for fd, event_set in expired_events:
+                self._drop_stale_fd_timestamps(fd)
+
+                if self._cancelled:
+                    self._cancelled.difference_update(
+                        (expired_timestamp, fd, event) for event in event_set)
+
+                if self._handles:
+                    for event in event_set:
+                        self._handles.pop((expired_timestamp, fd, event),
+                                          None)
+
+                if self._periodic_events:
+                    for event in event_set:
+                        expired_series.extend(self._periodic_events.pop(
+                            (expired_timestamp, fd, event), ()))
+
+        self._drop_stale_timestamps()
+
+        for series in expired_series:
+            self._add_occurrence(series,
+                                 series.get_next_index(not_before=timestamp))
 
     def remove_event_from_fd(self, timestamp, fd, event):
         """Remove a single event for a single fd from a single timestamp.
@@ -90,15 +332,567 @@ class EventPool(object):
         If the timestamp has no more fd entries in it after the removal -
         removes the timestamp from `future_events`.
         """
-        self._future_events[timestamp][fd].remove(event)
+        removed_fd, removed_timestamp = self._remove_from_bucket(timestamp,
+                                                                 fd,
+                                                                 event)
 
-        if not self._future_events[timestamp][fd]:
-            self._future_events[timestamp].pop(fd)
+        if self._cancelled:
+            self._cancelled.discard((timestamp, fd, event))
 
-        if not self._future_events[timestamp]:
-            self._future_events.pop(timestamp)
+        if self._handles:
+            self._handles.pop((timestamp, fd, event), None)
+
+        if removed_fd:
+            self._drop_stale_fd_timestamps(fd)
+
+        if removed_timestamp:
+            self._drop_stale_timestamps()
+
+        if self._periodic_events:
+            removed_series = self._periodic_events.pop((timestamp, fd, event),
+                                                       ())
+            for series in removed_series:
+                self._add_occurrence(series, series.get_next_index())
 
     def remove_events_from_fds(self, timestamp, fd_events):
         """Remove a list of [(fd, event), ...] from a single timestamp."""
         for fd, event in fd_events:
             self.remove_event_from_fd(timestamp, fd, event)
+
+    def _add_to_bucket(self, timestamp, fd, event):
+        """Add an event to the timestamp's bucket.
+
+        Return a tuple of (whether the timestamp is new to the pool,
+                           whether the fd is new to the timestamp).
+        """
+        ts_dict = self._future_events.get(timestamp)
+        new_timestamp = ts_dict is None
+        if new_timestamp:
+            ts_dict = self._future_events[timestamp] = {}
+
+        fd_set = ts_dict.get(fd)
+        new_fd = fd_set is None
+        if new_fd:
+            fd_set = ts_dict[fd] = set()
+
+        fd_set.add(event)
+
+        return new_timestamp, new_fd
+
+    def _add_to_buckets(self, timestamps, fds, events):
+        """Add events to their timestamps' buckets.
+
+        Return a tuple of ([timestamps that are new to the pool],
+                           {fd: [timestamps the fd is new to], ...}).
+        """
+        future_events = self._future_events
+        get_ts_dict = future_events.get
+        new_timestamps = []
+        new_fd_timestamps = collections.defaultdict(list)
+
+        for timestamp, fd, event in zip(timestamps, fds, events):
+            ts_dict = get_ts_dict(timestamp)
+            if ts_dict is None:
+                future_events[timestamp] = {fd: {event}}
+                new_timestamps.append(timestamp)
+                new_fd_timestamps[fd].append(timestamp)
+                continue
+
+            fd_set = ts_dict.get(fd)
+            if fd_set is None:
+                ts_dict[fd] = {event}
+                new_fd_timestamps[fd].append(timestamp)
+            else:
+                fd_set.add(event)
+
+        return new_timestamps, new_fd_timestamps
+
+    def _remove_from_bucket(self, timestamp, fd, event):
+        """Remove an event from the timestamp's bucket.
+
+        Return a tuple of (whether the fd has no events left in the timestamp,
+                           whether the timestamp has no events left).
+        """
+        ts_dict = self._future_events[timestamp]
+        ts_dict[fd].remove(event)
+
+        removed_fd = not ts_dict[fd]
+        if removed_fd:
+            ts_dict.pop(fd)
+
+        removed_timestamp = not ts_dict
+        if removed_timestamp:
+            self._future_events.pop(timestamp)
+
+        return removed_fd, removed_timestamp
+
+    def _get_bucket_events(self, timestamp, fd):
+        """Return the fd's events in the timestamp (empty if it has none)."""
+        return self._future_events.get(timestamp, {}).get(fd, ())
+
+    def _iter_bucket(self, timestamp):
+        """Return the timestamp's [(fd, set(events)), ...]."""
+        return self._future_events[timestamp].items()
+
+    def _pop_bucket(self, timestamp):
+        """Remove a timestamp and return its [(fd, set(events)), ...]."""
+        ts_dict = self._future_events.pop(timestamp, None)
+        return ts_dict.items() if ts_dict else ()
+
+    def _add_occurrence(self, series, index):
+        """Add the series' index'th occurrence to the pool.
+
+        Nothing is added if the index is None, past the end of the series or
+        if the series was cancelled.
+        """
+        timestamp = series.get_timestamp(index)
+        if timestamp is None or series.cancelled:
+            return
+
+        series.index = index
+        series.timestamp = timestamp
+        self._add_event(timestamp, series.fd, series.event, series)
+        self._periodic_events.setdefault(
+            (timestamp, series.fd, series.event), []).append(series)
+
+    def _cancel(self, handle):
+        """Mark a handle's event as cancelled (if it is still in the pool).
+
+        Nothing is cancelled if the handle's event was removed from the pool,
+        even if the same event was added again since.
+        """
+        key = (handle.timestamp, handle.fd, handle.event)
+
+        if self._handles.get(key) is handle:
+            self._cancelled.add(key)
+
+    def _drop_cancelled_events(self):
+        """Remove the cancelled events at the front of the pool."""
+        heap = self._timestamps
+
+        while self._cancelled and heap:
+            timestamp = heap[0]
+            cancelled = [(fd, event)
+                         for fd, event_set in self._iter_bucket(timestamp)
+                         for event in event_set
+                         if (timestamp, fd, event) in self._cancelled]
+
+            if not cancelled:
+                return
+
+            # Removing the events pops the timestamp off the heap if no other
+            # events are left in it.
+            self.remove_events_from_fds(timestamp, cancelled)
+
+    def _live_events(self, timestamp, fd, event_set, predicate=None):
+        """Return the fd's uncancelled events matching the predicate."""
+        if self._cancelled:
+            cancelled = self._cancelled
+            event_set = {event for event in event_set
+                         if (timestamp, fd, event) not in cancelled}
+        else:
+            event_set = set(event_set)
+
+        if predicate is not None:
+            event_set = {event for event in event_set if predicate(fd, event)}
+
+        return event_set
+
+    def _get_first_matching_timestamp(self, predicate, until=None):
+        """Return the earliest timestamp with uncancelled events matching.
+
+        The pool is filtered in no particular order, skipping the timestamps
+        that are later than `until` or than the earliest match found so far.
+        """
+        iter_bucket = self._iter_bucket
+        cancelled = self._cancelled
+
+        first = None
+        for timestamp in self._future_events:
+            if (first is not None and timestamp >= first) or \
+                    (until is not None and timestamp > until):
+                continue
+
+            for fd, event_set in iter_bucket(timestamp):
+                for event in event_set:
+                    if predicate(fd, event) and \
+                            (timestamp, fd, event) not in cancelled:
+                        first = timestamp
+                        break
+
+                if first == timestamp:
+                    break
+
+        return first
+
+    def _filter(self, timestamp, predicate=None):
+        """Return the [(fd, set(events)), ...] matching the predicate."""
+        out = []
+        for fd, event_set in self._iter_bucket(timestamp):
+            out_events = self._live_events(timestamp, fd, event_set, predicate)
+
+            if out_events:
+                out.append((fd, out_events))
+
+        return out
+
+    def _get_next_timestamp_for_fd(self, fd, predicate=None, before=None):
+        """Return the fd's first timestamp with events matching the predicate.
+
+        Timestamps that are not earlier than `before` are not looked at (and
+        None is returned if there is no earlier one).
+        """
+        self._drop_stale_fd_timestamps(fd)
+
+        for timestamp in self._iter_sorted(self._fd_timestamps.get(fd, [])):
+            if before is not None and timestamp >= before:
+                return None
+
+            event_set = self._get_bucket_events(timestamp, fd)
+            if not event_set:
+                continue
+
+            if self._cancelled or predicate is not None:
+                event_set = self._live_events(timestamp, fd, event_set,
+                                              predicate)
+
+            if event_set:
+                return timestamp
+
+        return None
+
+    def _iter_timestamps(self):
+        """Yield the pool's timestamps in ascending order."""
+        future_events = self._future_events
+
+        for timestamp in self._iter_sorted(self._timestamps):
+            if timestamp in future_events:
+                yield timestamp
+
+    @staticmethod
+    def _iter_sorted(heap):
+        """Yield the heap's distinct values in ascending order.
+
+        The heap is walked without being modified: a secondary heap holds the
+        frontier of heap indices, so getting the first k values costs
+        O(k log k) regardless of the size of the heap.
+        """
+        if not heap:
+            return
+
+        last = None
+        frontier = [(heap[0], 0)]
+        while frontier:
+            value, index = heapq.heappop(frontier)
+
+            # A value can be in the heap more than once, when a timestamp was
+            # removed and later added again.
+            if value != last:
+                last = value
+                yield value
+
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+
+    def _drop_stale_timestamps(self):
+        """Pop removed timestamps from the heap's front.
+
+        Removed timestamps that are not at the front are left in the heap until
+        they get to it, unless they make up most of the heap - then the heap is
+        rebuilt from `_future_events`.
+        """
+        heap = self._timestamps
+
+        while heap and heap[0] not in self._future_events:
+            heapq.heappop(heap)
+
+        if len(heap) > 2 * len(self._future_events) + 16:
+            self._timestamps = list(self._future_events)
+            heapq.heapify(self._timestamps)
+
+        self._update_deadline()
+
+    def _update_deadline(self):
+        """Set the clock deadline to the pool's earliest timestamp."""
+        if self._clock is None:
+            return
+
+        deadline = self._timestamps[0] if self._timestamps else float('inf')
+
+        if deadline != self._deadline:
+            self._deadline = deadline
+            self._clock.set_deadline(self, deadline)
+
+    def _drop_stale_fd_timestamps(self, fd):
+        """Pop timestamps the fd no longer has events in from its heap."""
+        heap = self._fd_timestamps.get(fd)
+        if heap is None:
+            return
+
+        while heap and not self._get_bucket_events(heap[0], fd):
+            heapq.heappop(heap)
+
+        if not heap:
+            self._fd_timestamps.pop(fd)
+
+
+class CompactEventPool(EventPool):
+    """An event pool that stores its events in a compact layout.
+
+    Every timestamp holds a flat tuple instead of a dict of sets:
+      self._future_events = {timestamp: (fd, event_mask, fd, event_mask, ...)}
+
+    The events are interned to bits of the mask, so the common case of a
+    timestamp with a single fd costs a single small tuple instead of a dict
+    and a set. Updating a timestamp rebuilds its tuple, which is cheap as
+    timestamps rarely hold more than a few fds. A timestamp that gets more
+    than `MAX_TUPLE_FDS` fds holds a dict instead:
+      self._future_events = {timestamp: {fd: event_mask, ...}}
+    so timestamps shared by many fds aren't rebuilt and searched on every
+    update.
+    """
+
+    MAX_TUPLE_FDS = 8
+
+    def __init__(self):
+        """Initialize the event pool."""
+        super(CompactEventPool, self).__init__()
+
+        self._event_bits = {}
+        self._bit_events = []
+
+    def _get_event_bit(self, event):
+        bit = self._event_bits.get(event)
+
+        if bit is None:
+            bit = self._event_bits[event] = 1 << len(self._bit_events)
+            self._bit_events.append(event)
+
+        return bit
+
+    def _get_events(self, mask):
+        events = set()
+
+        for bit_event in self._bit_events:
+            if not mask:
+                break
+
+            if mask & 1:
+                events.add(bit_event)
+
+            mask >>= 1
+
+        return events
+
+    @staticmethod
+    def _find_fd(bucket, fd):
+        """Return the index of the fd in the bucket (-1 if it isn't there)."""
+        for index in range(0, len(bucket), 2):
+            if bucket[index] is fd or bucket[index] == fd:
+                return index
+
+        return -1
+
+    def _add_to_bucket(self, timestamp, fd, event):
+        bit = self._get_event_bit(event)
+        bucket = self._future_events.get(timestamp)
+
+        if bucket is None:
+            self._future_events[timestamp] = (fd, bit)
+            return True, True
+
+        if type(bucket) is dict:
+            mask = bucket.get(fd)
+            bucket[fd] = bit if mask is None else mask | bit
+            return False, mask is None
+
+        index = self._find_fd(bucket, fd)
+        if index == -1:
+            if len(bucket) < 2 * self.MAX_TUPLE_FDS:
+                self._future_events[timestamp] = bucket + (fd, bit)
+            else:
+                bucket = dict(zip(bucket[::2], bucket[1::2]))
+                bucket[fd] = bit
+                self._future_events[timestamp] = bucket
+
+            return False, True
+
+        self._future_events[timestamp] = (bucket[:index + 1] +
+                                          (bucket[index + 1] | bit,) +
+                                          bucket[index + 2:])
+        return False, False
+
+    def _add_to_buckets(self, timestamps, fds, events):
+        new_timestamps = []
+        new_fd_timestamps = collections.defaultdict(list)
+
+        for timestamp, fd, event in zip(timestamps, fds, events):
+            new_timestamp, new_fd = self._add_to_bucket(timestamp, fd, event)
+
+            if new_timestamp:
+                new_timestamps.append(timestamp)
+
+            if new_fd:
+                new_fd_timestamps[fd].append(timestamp)
+
+        return new_timestamps, new_fd_timestamps
+
+    def _remove_from_bucket(self, timestamp, fd, event):
+        bucket = self._future_events[timestamp]
+        bit = self._event_bits.get(event, 0)
+
+        if type(bucket) is dict:
+            mask = bucket.get(fd, 0)
+            if not mask & bit:
+                raise KeyError(event)
+
+            mask &= ~bit
+            if mask:
+                bucket[fd] = mask
+                return False, False
+
+            del bucket[fd]
+            if bucket:
+                return True, False
+
+            self._future_events.pop(timestamp)
+            return True, True
+
+        index = self._find_fd(bucket, fd)
+        if index == -1 or not bucket[index + 1] & bit:
+            raise KeyError(event)
+
+        mask = bucket[index + 1] & ~bit
+        if mask:
+            self._future_events[timestamp] = (bucket[:index + 1] +
+                                              (mask,) +
+                                              bucket[index + 2:])
+            return False, False
+
+        bucket = bucket[:index] + bucket[index + 2:]
+        if bucket:
+            self._future_events[timestamp] = bucket
+            return True, False
+
+        self._future_events.pop(timestamp)
+        return True, True
+
+    def _get_bucket_events(self, timestamp, fd):
+        bucket = self._future_events.get(timestamp)
+        if bucket is None:
+            return ()
+
+        if type(bucket) is dict:
+            mask = bucket.get(fd)
+            return () if mask is None else self._get_events(mask)
+
+        index = self._find_fd(bucket, fd)
+        return () if index == -1 else self._get_events(bucket[index + 1])
+
+    def _iter_bucket(self, timestamp):
+        return self._unpack(self._future_events[timestamp])
+
+    def _pop_bucket(self, timestamp):
+        bucket = self._future_events.pop(timestamp, None)
+        return self._unpack(bucket) if bucket else ()
+
+    def _unpack(self, bucket):
+        """Return a bucket's [(fd, set(events)), ...]."""
+        if type(bucket) is dict:
+            return [(fd, self._get_events(mask))
+                    for fd, mask in bucket.items()]
+
+        return [(bucket[index], self._get_events(bucket[index + 1]))
+                for index in range(0, len(bucket), 2)]
+
+
+class EventHandle(object):
+    """A handle to an event that was added to the pool."""
+
+    def __init__(self, event_pool, timestamp, fd, event):
+        """Create a handle for the event at the given timestamp."""
+        self.timestamp = timestamp
+        self.fd = fd
+        self.event = event
+        self.cancelled = False
+
+        self._event_pool = event_pool
+
+    def cancel(self):
+        """Cancel the event.
+
+        The event is only marked as cancelled, it is removed from the pool when
+        it gets to the pool's front. Cancelling an event that already occurred
+        (or was already cancelled) does nothing.
+        """
+        if not self.cancelled:
+            self.cancelled = True
+            self._event_pool._cancel(self)
+
+
+class PeriodicEvent(EventHandle):
+    """A series of occurrences of an event, `interval` seconds apart.
+
+    `timestamp` is the time of the series' pending occurrence.
+    """
+
+    def __init__(self, event_pool, start, interval, fd, event,
+                 until=None, count=None):
+        """Create a series that starts at the given time."""
+        super(PeriodicEvent, self).__init__(event_pool, start, fd, event)
+
+        self.start = start
+        self.interval = interval
+        self.until = until
+        self.count = count
+        self.index = 0
+
+    def get_timestamp(self, index):
+        """Return the index'th occurrence's time (None if there isn't one)."""
+        if index is None or (self.count is not None and index >= self.count):
+            return None
+
+        # Multiplying (rather than adding the interval to the last occurrence)
+        # keeps float errors from accumulating over long series.
+        timestamp = self.start + index * self.interval
+
+        if self.until is not None and timestamp > self.until:
+            return None
+
+        return timestamp
+
+    def get_next_index(self, not_before=None):
+        """Return the index of the occurrence following the current one.
+
+        - not_before: Skip occurrences earlier than this time.
+        """
+        index = self.index + 1
+
+        if not_before is not None and not_before > self.start:
+            index = max(index,
+                        int(math.ceil((not_before - self.start) /
+                                      self.interval)))
+            while self.start + index * self.interval < not_before:
+                index += 1
+
+        return index
+
+
+def _to_list(column):
+    """Return a list of the column's values."""
+    if hasattr(column, 'tolist'):
+        # NumPy arrays (and the like) convert their items to python objects.
+        return column.tolist()
+
+    return column if isinstance(column, list) else list(column)
+
+
+def _extend_heap(heap, values):
+    """Add values to a heap (in place)."""
+    if len(values) > len(heap) // 8:
+        heap.extend(values)
+        heapq.heapify(heap)
+    else:
+        for value in values:
+            heapq.heappush(heap, value)
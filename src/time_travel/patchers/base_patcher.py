@@ -1,36 +1,53 @@
 """Base class for patching time and I/O modules."""
 
+import re
 import sys
-import inspect
+import types
+import bisect
+import fnmatch
+import weakref
+import itertools
+import threading
+
+
+# The attributes outside the module's namespace found to reference the real
+# objects, by module:
+# {(module name, real objects ids):
+#     (weakref(module), len(module.__dict__), attrs)}
+_scan_cache = {}
 
 
 class BasePatcher(object):
     """Base class for patching time and I/O modules."""
 
     # These modules will not be patched by default, unless explicitly specified
-    # in `modules_to_patch`.
+    # in `modules_to_patch` (by name, not by a pattern).
     # This is done to prevent time-travel from interfering with the timing of
     # the actual test environment.
-    UNPATCHED_MODULES = ['pytest', '_pytest', 'unittest', 'mock', 'threading']
+    UNPATCHED_MODULES = ['pytest', '_pytest', 'unittest', 'mock', 'threading',
+                         'queue', 'Queue']
 
     def __init__(self,
                  clock,
                  event_pool,
                  modules_to_patch=None,
+                 modules_to_skip=None,
                  patcher_module=None):
-        """Create the patch."""
+        """Create the patch.
+
+        `modules_to_patch` and `modules_to_skip` are module names or glob
+        patterns ('myapp.*') of the loaded modules to search in and to leave
+        out of the search.
+        """
         self.clock = clock
         self.event_pool = event_pool
 
-        if modules_to_patch is None:
-            self.modules_to_patch = []
-        elif isinstance(modules_to_patch, (list, tuple)):
-            self.modules_to_patch = modules_to_patch
-        else:
-            self.modules_to_patch = [modules_to_patch]
+        self.modules_to_patch = _to_names_list(modules_to_patch)
+        self.modules_to_skip = _to_names_list(modules_to_skip)
 
         self.patcher_module = patcher_module if patcher_module else None
         self._undo_set = set()
+        self._active_patches = []
 
     @classmethod
     def get_events_namespace(cls):
@@ -46,6 +63,14 @@ class BasePatcher(object):
         """Return the actual module obect to be patched."""
         raise NotImplementedError()
 
+    def set_active(self, active):
+        """Switch the fakes between the time-travel clock and the real one.
+
+        Only used by armed patchers (see `TimeTravel.arm`), whose fake
+        functions are switched for them. Patchers whose fakes are classes
+        switch them here.
+        """
+
     def get_patch_actions(self):
         """Return list of the patches to do.
 
@@ -56,9 +81,13 @@ class BasePatcher(object):
         """
         raise NotImplementedError()
 
-    def start(self):
+    def start(self, patch_loaded_modules=True):
         """Start the patcher.
 
+        If `patch_loaded_modules` is False only the patched module itself is
+        changed, and the references in the loaded modules are left for the
+        caller to patch (see `start_patchers`).
+
         The logic to the patchers start is based on the work done by:
         spulec/freezegun
         under
@@ -86,8 +115,6 @@ class BasePatcher(object):
         """
         patch_actions = self.get_patch_actions()
 
-        real_id_to_fake = {id(real): fake for _, real, fake in patch_actions}
-
         patched_module = self.get_patched_module()
 
         # Change modules for later imports.
@@ -95,49 +122,97 @@ class BasePatcher(object):
             self._save_for_undo(patched_module, obj_name, real_obj)
             setattr(patched_module, obj_name, fake_obj)
 
+        self._active_patches = [(real, fake)
+                                for _, real, fake in patch_actions]
+
+        if patch_loaded_modules:
+            _patch_references(self.get_modules_to_patch(),
+                              {id(real): (fake, self)
+                               for real, fake in self._active_patches})
+
+    def get_active_patches(self):
+        """Return [(real_object, fake_object), ...] of the started patcher."""
+        return self._active_patches
+
+    def get_modules_to_patch(self,
+                             module_index=None,
+                             unpatched_module_names=None):
+        """Return the loaded modules to search for the patched objects.
+
+        - module_index: A `ModuleIndex` of the loaded modules (built if None).
+        - unpatched_module_names: The modules that are not searched by default
+                                  (`get_unpatched_module_names()` if None).
+        """
+        if module_index is None:
+            module_index = ModuleIndex()
+
+        if unpatched_module_names is None:
+            unpatched_module_names = self.get_unpatched_module_names()
+
         if self.modules_to_patch:
             # If only a given list of modules is required to be patched
-            modules = [sys.modules[name] for name in self.modules_to_patch]
+            modules = {}
+            for name in self.modules_to_patch:
+                if _is_pattern(name):
+                    for matched_name in module_index.match(name):
+                        module = module_index.modules[matched_name]
+                        if not _is_unpatched(matched_name, module,
+                                             unpatched_module_names):
+                            modules[matched_name] = module
+                else:
+                    modules[name] = sys.modules[name]
         else:
             # not given a specific module to patch on.
-            # Create the list of all modules to search for the patched objects.
             # Patch on all loaded modules.
-            modules = [
-                module for mod_name, module in sys.modules.items() if
-                (inspect.ismodule(module)
-                 and hasattr(module, '__name__')
-                 # Don't patch inside the original module, this (the patcher)
-                 # module, or the unpatched modules.
-                 and module.__name__ not in ([patched_module,
-                                              self.patcher_module,
-                                              __name__]
-                                             + self.UNPATCHED_MODULES
-                                             )
-                 )
-            ]
-
-        # Search in all modules for the object to patch.
-        for module in modules:
-            for attr in dir(module):
-                try:
-                    # Get any attribute loaded on the module.
-                    attribute_value = getattr(module, attr)
-                except (ValueError, AttributeError, ImportError):
-                    # For some libraries, this happen.
-                    # e.g. attr=dbm_gnu, module=pkg_resources._vendor.six.moves
-                    continue
+            modules = {name: module
+                       for name, module in module_index.modules.items()
+                       if not _is_unpatched(name, module,
+                                            unpatched_module_names)}
 
-                # If the attribute is on this module - avoid recursion.
-                # Do stuff only if the attribute is the object to patch.
-                if id(attribute_value) not in real_id_to_fake.keys():
-                    continue
+        for pattern in self.modules_to_skip:
+            for name in module_index.match(pattern):
+                modules.pop(name, None)
+
+        return list(modules.values())
+
+    def is_module_to_patch(self, name):
+        """Return whether a module imported after the start is patched.
+
+        The module has to match `modules_to_patch` (if given) and not match
+        `modules_to_skip`.
+        """
+        if self.modules_to_patch and \
+                not any(fnmatch.fnmatchcase(name, pattern)
+                        for pattern in self.modules_to_patch):
+            return False
+
+        return not self.is_module_to_skip(name)
+
+    def is_module_to_skip(self, name):
+        """Return whether a module is left out by `modules_to_skip`."""
+        return any(fnmatch.fnmatchcase(name, pattern)
+                   for pattern in self.modules_to_skip)
+
+    def get_unpatched_module_names(self):
+        """Return the names of the modules that are not searched by default.
+
+        Don't patch inside the original module, this (the patcher) module, or
+        the unpatched modules. The modules of time-travel itself are never
+        searched by default either (see `_is_unpatched`).
+        """
+        return set([self.get_patched_module().__name__,
+                    self.patcher_module,
+                    __name__] + self.UNPATCHED_MODULES)
 
-                # Find the relative mock object for the original class.
-                fake_obj = real_id_to_fake.get(id(attribute_value))
-                # Change the class to the mocked one in the given module.
-                setattr(module, attr, fake_obj)
-                # Save the original class for later - when stopping the patch.
-                self._save_for_undo(module, attr, attribute_value)
+    @staticmethod
+    def clear_scan_cache():
+        """Forget which module attributes referenced the patched objects.
+
+        The next start scans all modules again. Only needed if an attribute a
+        module provides outside its namespace (through a module `__getattr__`)
+        became a patched object after a start.
+        """
+        _scan_cache.clear()
 
     def stop(self):
         """Stop the patching."""
@@ -145,6 +220,321 @@ class BasePatcher(object):
             setattr(module, attribute, original_value)
 
         self._undo_set.clear()
+        self._active_patches = []
 
     def _save_for_undo(self, module, attribute, original_value):
         self._undo_set.add((module, attribute, original_value))
+
+
+def _find_references(module, real_ids):
+    """Return the names of the module's attributes that are real objects.
+
+    The module's namespace is checked on every call, so attributes that were
+    rebound since the last call are found. The full search (through `dir`,
+    which also finds attributes that aren't in the namespace) is only done
+    again if the module is new or its namespace has changed size since it was
+    last searched. Otherwise only the attributes outside the namespace that
+    were found in the last search are checked.
+    """
+    key = (module.__name__, real_ids)
+    namespace = getattr(module, '__dict__', {})
+
+    cached = _scan_cache.get(key)
+    if cached is None or cached[0]() is not module or \
+            cached[1] != len(namespace):
+        attrs = _scan(module, real_ids)
+        _scan_cache[key] = (_weakref(module),
+                            len(namespace),
+                            [attr for attr in attrs if attr not in namespace])
+        return attrs
+
+    attrs = []
+    if not real_ids.isdisjoint(map(id, namespace.values())):
+        attrs = [attr for attr, value in namespace.items()
+                 if id(value) in real_ids]
+
+    return attrs + [attr for attr in cached[2]
+                    if id(getattr(module, attr, None)) in real_ids]
+
+
+def _weakref(module):
+    """Return a weak reference to the module (or a dead one if it has none).
+
+    The module isn't referenced by the id, which may be reused by a new
+    module of the same name.
+    """
+    try:
+        return weakref.ref(module)
+    except TypeError:
+        return lambda: None
+
+
+def _scan(module, real_ids):
+    """Return the names of the module's attributes that are real objects."""
+    attrs = []
+
+    for attr in dir(module):
+        try:
+            # Get any attribute loaded on the module.
+            attribute_value = getattr(module, attr)
+        except (ValueError, AttributeError, ImportError):
+            # For some libraries, this happen.
+            # e.g. attr=dbm_gnu, module=pkg_resources._vendor.six.moves
+            continue
+
+        # Do stuff only if the attribute is the object to patch.
+        if id(attribute_value) in real_ids:
+            attrs.append(attr)
+
+    return attrs
+
+
+def start_patchers(patchers):
+    """Start the patchers with a single search of the loaded modules.
+
+    Patchers that search the same modules (all of the loaded modules, by
+    default) are searched for at once, skipping the modules that any of them
+    doesn't patch by default. The loaded modules are indexed once for all the
+    patchers.
+    """
+    module_index = ModuleIndex()
+
+    # {(modules_to_patch, modules_to_skip): [patcher, ...]}
+    groups = {}
+    for patcher in patchers:
+        patcher.start(patch_loaded_modules=False)
+
+        key = (tuple(patcher.modules_to_patch), tuple(patcher.modules_to_skip))
+        groups.setdefault(key, []).append(patcher)
+
+    for group in groups.values():
+        # {id(real_object): (fake_object, patcher)}
+        patches = {}
+        unpatched_module_names = set()
+
+        for patcher in group:
+            unpatched_module_names.update(
+                patcher.get_unpatched_module_names())
+            for real, fake in patcher.get_active_patches():
+                patches[id(real)] = (fake, patcher)
+
+        if patches:
+            _patch_references(
+                group[0].get_modules_to_patch(module_index,
+                                              unpatched_module_names),
+                patches)
+
+
+class ModuleIndex(object):
+    """The loaded modules, with their names sorted for pattern lookups."""
+
+    def __init__(self):
+        """Index the modules that are currently loaded."""
+        # {name: module}
+        self.modules = {name: module
+                        for name, module in list(sys.modules.items())
+                        if isinstance(module, types.ModuleType)}
+        self.names = sorted(self.modules)
+
+    def match(self, pattern):
+        """Return the names of the loaded modules that match a glob pattern.
+
+        Only the names that start with the pattern's literal prefix are
+        matched against it.
+        """
+        if not _is_pattern(pattern):
+            return [pattern] if pattern in self.modules else []
+
+        prefix = pattern[:_PATTERN_CHARS.search(pattern).start()]
+
+        names = itertools.islice(self.names,
+                                 bisect.bisect_left(self.names, prefix),
+                                 None)
+        names = itertools.takewhile(lambda name: name.startswith(prefix),
+                                    names)
+
+        return [name for name in names if fnmatch.fnmatchcase(name, pattern)]
+
+
+class ImportHook(object):
+    """A `sys.meta_path` finder that patches modules as they are imported.
+
+    Each module is patched right after its code runs, so names it bound at
+    import time (`from time import time`) are patched like the ones of
+    modules that were loaded when the patchers started. Both the real objects
+    and the fakes it bound are restored when the patchers stop, including the
+    fakes bound by modules that the patchers don't patch.
+
+    Only modules imported through a loader with `exec_module` (Python 3) are
+    patched.
+    """
+
+    def __init__(self, patchers):
+        """Create a hook patching the objects of the started patchers."""
+        # {id(real or fake object): (real_object, fake_object, patcher)}
+        self._patches = {}
+        self._unpatched_module_names = set()
+
+        for patcher in patchers:
+            self._unpatched_module_names.update(
+                patcher.get_unpatched_module_names())
+
+            for real, fake in patcher.get_active_patches():
+                self._patches[id(real)] = (real, fake, patcher)
+                self._patches[id(fake)] = (real, fake, patcher)
+
+        self._ids = frozenset(self._patches)
+        self._installed = False
+
+        # Set while the hook is asking the other finders, which may include
+        # another hook that asks this one.
+        self._finding = threading.local()
+
+    def install(self):
+        """Start patching imported modules."""
+        sys.meta_path.insert(0, self)
+        self._installed = True
+
+    def uninstall(self):
+        """Stop patching imported modules."""
+        self._installed = False
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        """Find the module's spec with the other finders and hook its loader.
+
+        Return None (leaving the import to the other finders) if they can't
+        find it, or if the hook is already finding it.
+        """
+        if getattr(self._finding, 'active', False):
+            return None
+
+        self._finding.active = True
+        try:
+            for finder in sys.meta_path:
+                find_spec = getattr(finder, 'find_spec', None)
+                if finder is self or find_spec is None:
+                    continue
+
+                spec = find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.active = False
+
+        # Modules that aren't patched are hooked as well, as they may bind the
+        # fakes at import time, and those have to be restored on stop.
+        if hasattr(spec.loader, 'exec_module'):
+            spec.loader = _PatchingLoader(spec.loader, self)
+
+        return spec
+
+    def patch_module(self, module):
+        """Patch the module's references to the real (or fake) objects."""
+        if not self._installed:
+            return
+
+        for attr in _find_references(module, self._ids):
+            value = getattr(module, attr)
+            real, fake, patcher = self._patches[id(value)]
+
+            if value is real:
+                if not self._is_module_to_patch(patcher, module.__name__):
+                    continue
+
+                setattr(module, attr, fake)
+
+            # A fake bound at import time is restored whatever the module
+            # filters are, as the fake is useless once the patcher stops.
+            patcher._save_for_undo(module, attr, real)
+
+    def _is_module_to_patch(self, patcher, name):
+        """Return whether the patcher replaces the real objects of a module.
+
+        Modules that aren't patched by default are only patched if given to
+        the patcher by name.
+        """
+        if not patcher.is_module_to_patch(name):
+            return False
+
+        return name in patcher.modules_to_patch or \
+            not _is_unpatched(name, None, self._unpatched_module_names)
+
+
+class _PatchingLoader(object):
+    """Wraps a module's loader to patch the module once it is executed."""
+
+    def __init__(self, loader, hook):
+        self._loader = loader
+        self._hook = hook
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        create_module = getattr(self._loader, 'create_module', None)
+        return None if create_module is None else create_module(spec)
+
+    def exec_module(self, module):
+        # Leave the real loader on the module, for later reloads.
+        module.__loader__ = self._loader
+        spec = getattr(module, '__spec__', None)
+        if spec is not None:
+            spec.loader = self._loader
+
+        self._loader.exec_module(module)
+        self._hook.patch_module(module)
+
+
+_PATTERN_CHARS = re.compile(r'[*?[]')
+
+_PACKAGE_NAME = __name__.partition('.')[0]
+
+
+def _is_unpatched(name, module, unpatched_module_names):
+    """Return whether a module is left out of the default or pattern search.
+
+    time-travel's own modules hold the real objects the fakes call, so they
+    are always left out.
+    """
+    return (name in unpatched_module_names or
+            getattr(module, '__name__', name) in unpatched_module_names or
+            name == _PACKAGE_NAME or
+            name.startswith(_PACKAGE_NAME + '.'))
+
+
+def _is_pattern(name):
+    return _PATTERN_CHARS.search(name) is not None
+
+
+def _to_names_list(names):
+    if names is None:
+        return []
+    elif isinstance(names, (list, tuple)):
+        return names
+    else:
+        return [names]
+
+
+def _patch_references(modules, patches):
+    """Replace the modules' references to real objects with the fakes.
+
+    - patches: {id(real_object): (fake_object, patcher)}, the patcher saves
+               the original value for undo.
+    """
+    real_ids = frozenset(patches)
+
+    # Search in all modules for the object to patch.
+    for module in modules:
+        for attr in _find_references(module, real_ids):
+            attribute_value = getattr(module, attr)
+
+            # Find the relative mock object for the original class.
+            fake_obj, patcher = patches[id(attribute_value)]
+            # Change the class to the mocked one in the given module.
+            setattr(module, attr, fake_obj)
+            # Save the original class for later - when stopping the patch.
+            patcher._save_for_undo(module, attr, attribute_value)
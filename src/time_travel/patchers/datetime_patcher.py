@@ -16,24 +16,24 @@ _real_date = datetime.date
 
 
 def with_metaclass(meta, name, *bases):
-    """Create a base class with a metaclass."""
-    return meta(name, bases, {})
+    """Create a base class with a metaclass (and no `__dict__`)."""
+    return meta(name, bases, {'__slots__': ()})
 
 
 class DateSubclassMeta(type):
-    """Date mock metaclass to check instancechek to the real class."""
+    """Date mock metaclass to check instancechek to the real class.
 
-    @classmethod
-    def __instancecheck__(mcs, obj):
-        return isinstance(obj, _real_date)
+    The check is the real class's own (bound) `__instancecheck__`, so it runs
+    without a Python-level call.
+    """
+
+    __instancecheck__ = staticmethod(_real_date.__instancecheck__)
 
 
 class DatetimeSubclassMeta(DateSubclassMeta):
     """Datetime mock metaclass to check instancechek to the real class."""
 
-    @classmethod
-    def __instancecheck__(mcs, obj):
-        return isinstance(obj, _real_datetime)
+    __instancecheck__ = staticmethod(_real_datetime.__instancecheck__)
 
 
 def date_to_fakedate(date):
@@ -56,17 +56,19 @@ def datetime_to_fakedatetime(datetime):
 
 
 class FakeDate(with_metaclass(DateSubclassMeta, 'date', _real_date)):
-    """Mocked datetime.date class."""
+    """Mocked datetime.date class.
+
+    The mocked classes don't override `__new__`, so they are constructed (and
+    returned from arithmetic) by the real classes' C code, and have no
+    `__dict__`, so their instances are as small as the real ones.
+    """
 
-    def __new__(cls, *args, **kwargs):
-        """Return a new mocked date object."""
-        return _real_date.__new__(cls, *args, **kwargs)
+    __slots__ = ()
 
     @classmethod
     def today(cls):
         """Return today's date."""
-        result = cls._now()
-        return date_to_fakedate(result)
+        return cls._today()
 
 
 FakeDate.min = date_to_fakedate(_real_date.min)
@@ -77,20 +79,25 @@ class FakeDatetime(with_metaclass(DatetimeSubclassMeta, 'datetime',
                                   _real_datetime, FakeDate)):
     """Mocked datetime.datetime class."""
 
-    def __new__(cls, *args, **kwargs):
-        """Return a new mocked datetime object."""
-        return _real_datetime.__new__(cls, *args, **kwargs)
+    __slots__ = ()
 
     @classmethod
     def now(cls, tz=None):
         """Return a datetime object representing current time."""
-        now = cls._now()
-        if tz:
-            result = tz.fromutc(now.replace(tzinfo=tz)) +\
-                datetime.timedelta(hours=cls._tz_offset())
-        else:
-            result = now
-        return datetime_to_fakedatetime(result)
+        if tz is not None:
+            return cls._now_in(tz)
+
+        return cls._now()
+
+    @classmethod
+    def now_in_zones(cls, zones):
+        """Return a list of the current time in each of the given timezones.
+
+        Each time is converted once per clock time, however many times (and
+        with whatever zones) it is asked for.
+        """
+        now_in = cls._now_in
+        return [now_in(tz) for tz in zones]
 
     @classmethod
     def today(cls):
@@ -100,35 +107,74 @@ class FakeDatetime(with_metaclass(DatetimeSubclassMeta, 'datetime',
     @classmethod
     def utcnow(cls):
         """Return a datetime object representing current time."""
-        result = cls._now()
-        return datetime_to_fakedatetime(result)
+        return cls._utcnow()
 
 
 FakeDatetime.min = datetime_to_fakedatetime(_real_datetime.min)
 FakeDatetime.max = datetime_to_fakedatetime(_real_datetime.max)
 
 
-def pickle_fake_date(datetime_):
-    """Pickle function for FakeDate."""
-    return FakeDate, (
-        datetime_.year,
-        datetime_.month,
-        datetime_.day,
-    )
+def _returning_fakes(method):
+    """Wrap an arithmetic method to return mocked objects, not real ones."""
+    def wrapper(self, other):
+        result = method(self, other)
+
+        if type(result) is _real_datetime:
+            return datetime_to_fakedatetime(result)
+        elif type(result) is _real_date:
+            return date_to_fakedate(result)
+
+        return result
+
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+# Since Python 3.8 arithmetic keeps the subclass, before it the real classes
+# are returned.
+if type(FakeDate(2000, 1, 1) + datetime.timedelta()) is not FakeDate:
+    for _cls, _real_cls in [(FakeDate, _real_date),
+                            (FakeDatetime, _real_datetime)]:
+        for _name in ['__add__', '__radd__', '__sub__']:
+            setattr(_cls, _name, _returning_fakes(getattr(_real_cls, _name)))
+
+
+def _real_now():
+    """Return the real current time, as a mocked datetime object."""
+    return super(FakeDatetime, FakeDatetime).now()
+
+
+def _real_now_in(tz):
+    """Return the real current time in `tz`, as a mocked datetime object."""
+    return super(FakeDatetime, FakeDatetime).now(tz)
+
+
+def _real_utcnow():
+    """Return the real current UTC time, as a mocked datetime object."""
+    return super(FakeDatetime, FakeDatetime).utcnow()
+
+
+def _real_today():
+    """Return the real current date, as a mocked date object."""
+    return super(FakeDate, FakeDate).today()
+
+
+def pickle_fake_date(date_):
+    """Pickle function for FakeDate.
+
+    Keeps the real date's compact binary state, but unpickles as a FakeDate.
+    """
+    return FakeDate, date_.__reduce_ex__(4)[1]
 
 
 def pickle_fake_datetime(datetime_):
-    """Pickle function for FakeDatetime."""
-    return FakeDatetime, (
-        datetime_.year,
-        datetime_.month,
-        datetime_.day,
-        datetime_.hour,
-        datetime_.minute,
-        datetime_.second,
-        datetime_.microsecond,
-        datetime_.tzinfo,
-    )
+    """Pickle function for FakeDatetime.
+
+    Keeps the real datetime's compact binary state (and tzinfo), but
+    unpickles as a FakeDatetime. The state of protocol 4 is used, as only it
+    keeps the datetime's `fold`.
+    """
+    return FakeDatetime, datetime_.__reduce_ex__(4)[1]
 
 
 class DatetimePatcher(BasePatcher):
@@ -146,8 +192,16 @@ class DatetimePatcher(BasePatcher):
         super(DatetimePatcher, self).__init__(patcher_module=__name__,
                                               **kwargs)
 
-        FakeDate._now = self._now
-        FakeDatetime._now = self._now
+        # The clock time of the last `_now` and `_today` calls, and their
+        # results.
+        self._now_cache = (None, None)
+        self._today_cache = (None, None)
+
+        # The clock time of the last `_now_in` calls, and their results:
+        # (time, {tz: now})
+        self._zones_cache = (None, {})
+
+        self.set_active(True)
 
     def get_patched_module(self):
         """Return the actual module obect to be patched."""
@@ -160,9 +214,9 @@ class DatetimePatcher(BasePatcher):
             ('datetime', _real_datetime, FakeDatetime)
         ]
 
-    def start(self):
+    def start(self, **kwargs):
         """Change pickle function for datetime to handle mocked datetime."""
-        super(DatetimePatcher, self).start()
+        super(DatetimePatcher, self).start(**kwargs)
 
         copyreg.dispatch_table[_real_datetime] = pickle_fake_datetime
         copyreg.dispatch_table[_real_date] = pickle_fake_date
@@ -174,5 +228,63 @@ class DatetimePatcher(BasePatcher):
 
         super(DatetimePatcher, self).stop()
 
+    def set_active(self, active):
+        """Make the fake classes use the time-travel clock or the real one."""
+        if active:
+            FakeDatetime._now = FakeDatetime._utcnow = self._now
+            FakeDatetime._now_in = self._now_in
+            FakeDate._today = self._today
+        else:
+            FakeDatetime._now = _real_now
+            FakeDatetime._now_in = _real_now_in
+            FakeDatetime._utcnow = _real_utcnow
+            FakeDate._today = _real_today
+
     def _now(self):
-        return _real_datetime.fromtimestamp(self.clock.time)
+        """Return the clock time as a mocked datetime object.
+
+        The result is kept until the clock time changes, as the mocked
+        datetime objects are immutable.
+        """
+        time = self.clock.time
+        cached_time, now = self._now_cache
+
+        if time != cached_time:
+            now = FakeDatetime.fromtimestamp(time)
+            self._now_cache = (time, now)
+
+        return now
+
+    def _now_in(self, tz):
+        """Return the clock time in `tz` as a mocked datetime object.
+
+        The results are kept per timezone until the clock time changes.
+        """
+        time = self.clock.time
+        cached_time, zones = self._zones_cache
+
+        if time != cached_time:
+            zones = {}
+            self._zones_cache = (time, zones)
+
+        try:
+            now = zones.get(tz)
+        except TypeError:
+            # An unhashable timezone.
+            return FakeDatetime.fromtimestamp(time, tz)
+
+        if now is None:
+            now = zones[tz] = FakeDatetime.fromtimestamp(time, tz)
+
+        return now
+
+    def _today(self):
+        """Return the clock date as a mocked date object (cached as `_now`)."""
+        time = self.clock.time
+        cached_time, today = self._today_cache
+
+        if time != cached_time:
+            today = FakeDate.fromtimestamp(time)
+            self._today_cache = (time, today)
+
+        return today
@@ -74,10 +74,12 @@ class MockPollObject(object):
         timeout_timestamp = self.clock.time + timeout
 
         def _is_relevant_fd_event(fd, evt):
-            return fd in self.poll_events and self.poll_events[fd] & evt
+            return self.poll_events[fd] & evt
 
         # fd_events is a list of [(fd, set(events)), ...].
-        ts, fd_events = self.event_pool.get_next_event(_is_relevant_fd_event)
+        ts, fd_events = self.event_pool.get_next_event_for_fds(
+            self.poll_events,
+            _is_relevant_fd_event)
 
         if ts is None or ts > timeout_timestamp:
             return timeout_timestamp, []
@@ -0,0 +1,126 @@
+"""Registry of the patchers that time-travel uses."""
+
+import importlib
+import select
+
+
+ENTRY_POINTS_GROUP = 'time_travel.patchers'
+
+# The patchers that come with time-travel, by name. They are imported only
+# when they are used, and don't need the package's entry points to be found.
+BUILTIN_PATCHERS = {
+    'datetime_patcher':
+        'time_travel.patchers.datetime_patcher:DatetimePatcher',
+    'select_patcher': 'time_travel.patchers.select_patcher:SelectPatcher',
+    'time_patcher': 'time_travel.patchers.time_patcher:TimePatcher',
+}
+
+if hasattr(select, 'poll'):
+    BUILTIN_PATCHERS['poll_patcher'] = \
+        'time_travel.patchers.poll_patcher:PollPatcher'
+if hasattr(select, 'epoll'):
+    BUILTIN_PATCHERS['epoll_patcher'] = \
+        'time_travel.patchers.epoll_patcher:EpollPatcher'
+
+# The patchers registered by other packages, read once per process:
+# {name: entry_point}
+_entry_points = None
+
+# {name: patcher_class}
+_loaded_patchers = {}
+
+
+def get_patcher_names():
+    """Return the names of all the registered patchers."""
+    return sorted(set(BUILTIN_PATCHERS) | set(_get_entry_points()))
+
+
+def load_patcher(name):
+    """Return the patcher class registered by `name`."""
+    patcher = _loaded_patchers.get(name)
+
+    if patcher is None:
+        if name in BUILTIN_PATCHERS:
+            module_name, class_name = BUILTIN_PATCHERS[name].split(':')
+            patcher = getattr(importlib.import_module(module_name),
+                              class_name)
+        else:
+            patcher = _get_entry_points()[name].load()
+
+        _loaded_patchers[name] = patcher
+
+    return patcher
+
+
+def load_patchers(names=None):
+    """Return the classes of the registered patchers.
+
+    - names: The patchers to load (all of them if None). A patcher is given by
+             its name ('time_patcher'), its name without the '_patcher'
+             suffix ('time') or its events namespace.
+
+    Only the requested patchers are imported (unless one is given by a
+    namespace that doesn't match a name).
+    """
+    if names is None:
+        names = get_patcher_names()
+    else:
+        if not isinstance(names, (list, tuple, set)):
+            names = [names]
+
+        names = sorted(set(_resolve_patcher_name(name) for name in names))
+
+    return [load_patcher(name) for name in names]
+
+
+def _resolve_patcher_name(name):
+    registered_names = get_patcher_names()
+
+    if name in registered_names:
+        return name
+
+    if name + '_patcher' in registered_names:
+        return name + '_patcher'
+
+    for registered_name in registered_names:
+        if load_patcher(registered_name).get_events_namespace() == name:
+            return registered_name
+
+    raise ValueError('no patcher named {} (registered patchers: {})'.
+                     format(name, ', '.join(registered_names)))
+
+
+def _get_entry_points():
+    global _entry_points
+
+    if _entry_points is None:
+        _entry_points = {entry_point.name: entry_point
+                         for entry_point in _iter_entry_points()
+                         if entry_point.name not in BUILTIN_PATCHERS}
+
+    return _entry_points
+
+
+def _iter_entry_points():
+    """Return the entry points of the patchers group.
+
+    `importlib.metadata` is used where available, `pkg_resources` (which is
+    much slower to import) otherwise.
+    """
+    try:
+        from importlib import metadata
+    except ImportError:
+        try:
+            import importlib_metadata as metadata
+        except ImportError:
+            metadata = None
+
+    if metadata is None:
+        import pkg_resources
+        return list(pkg_resources.iter_entry_points(group=ENTRY_POINTS_GROUP))
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return list(entry_points.select(group=ENTRY_POINTS_GROUP))
+
+    return list(entry_points.get(ENTRY_POINTS_GROUP, ()))
@@ -38,59 +38,48 @@ class SelectPatcher(BasePatcher):
     def _list_intersection(list1, list2):
         return list(set(list1).intersection(set(list2)))
 
-    def _get_earliest_events(self, waited_fds, event, timeout):
+    def _get_earliest_events(self, interests, timeout):
+        """Return the earliest (timestamp, [(fd, set(events)), ...]).
+
+        - interests: A dict of {event: set(fds)} that are waited on.
+        """
         added_timeout = float('inf') if timeout is None else timeout
 
         timeout_timestamp = self.clock.time + added_timeout
 
         def _is_relevant_fd_event(fd, evt):
-            return fd in waited_fds and evt == event
+            return fd in interests.get(evt, ())
 
         # fd_events is a list of [(fd, set(events)), ...].
-        ts, fd_events = self.event_pool.get_next_event(
+        ts, fd_events = self.event_pool.get_next_event_for_fds(
+            set().union(*interests.values()),
             _is_relevant_fd_event)
 
         if ts is None or ts > timeout_timestamp:
             return timeout_timestamp, []
         else:
-            return ts, [fd for fd, _ in fd_events]
+            return ts, fd_events
 
     def _mocked_select(self, rlist, wlist, xlist, timeout=None):
-        read_timestamp, read_fds = self._get_earliest_events(
-            rlist,
-            self.EventTypes.READ,
-            timeout)
-        write_timestamp, write_fds = self._get_earliest_events(
-            wlist,
-            self.EventTypes.WRITE,
-            timeout)
-        ex_timestamp, ex_fds = self._get_earliest_events(
-            xlist,
-            self.EventTypes.EXCEPTIONAL,
+        timestamp, fd_events = self._get_earliest_events(
+            {self.EventTypes.READ: set(rlist),
+             self.EventTypes.WRITE: set(wlist),
+             self.EventTypes.EXCEPTIONAL: set(xlist)},
             timeout)
 
-        timestamp = min([read_timestamp,
-                         write_timestamp,
-                         ex_timestamp])
-
         if timestamp == float('inf'):
             raise ValueError('No relevant future events were set for infinite '
                              'timout')
 
-        read_fds = [] if timestamp < read_timestamp else read_fds
-        write_fds = [] if timestamp < write_timestamp else write_fds
-        ex_fds = [] if timestamp < ex_timestamp else ex_fds
-
-        self.event_pool.remove_events_from_fds(
-            timestamp,
-            [(fd, self.EventTypes.READ) for fd in read_fds])
-        self.event_pool.remove_events_from_fds(
-            timestamp,
-            [(fd, self.EventTypes.WRITE) for fd in write_fds])
         self.event_pool.remove_events_from_fds(
             timestamp,
-            [(fd, self.EventTypes.EXCEPTIONAL) for fd in ex_fds])
+            [(fd, event) for fd, events in fd_events for event in events])
 
         self.clock.time = timestamp
 
-        return read_fds, write_fds, ex_fds
+        return ([fd for fd, events in fd_events
+                 if self.EventTypes.READ in events],
+                [fd for fd, events in fd_events
+                 if self.EventTypes.WRITE in events],
+                [fd for fd, events in fd_events
+                 if self.EventTypes.EXCEPTIONAL in events])
@@ -4,6 +4,25 @@ from .base_patcher import BasePatcher
 
 import time
 
+try:
+    from types import SimpleNamespace
+except ImportError:
+    SimpleNamespace = None
+
+
+# Clocks that are served from the time-travel clock (where available).
+CLOCKS = ['monotonic', 'perf_counter', 'process_time', 'thread_time']
+
+NS_CLOCKS = ['time_ns'] + [clock + '_ns' for clock in CLOCKS]
+
+_real_get_clock_info = getattr(time, 'get_clock_info', None)
+
+_real_localtime = time.localtime
+_real_gmtime = time.gmtime
+_real_ctime = time.ctime
+_real_asctime = time.asctime
+_real_strftime = time.strftime
+
 
 class TimePatcher(BasePatcher):
     """Patcher of the time module.
@@ -11,23 +30,64 @@ class TimePatcher(BasePatcher):
     Patching:
         - time
         - sleep
+        - monotonic, perf_counter, process_time and thread_time
+        - the *_ns variants of the above
+        - get_clock_info
+        - localtime, gmtime, ctime, asctime and strftime (when called
+          without a time)
+    (where available)
+
+    All the clocks return the time-travel clock's time, so differences
+    between readings measure time in the time-travel clock.
+
+    The struct_time and string results of the current time are kept until the
+    time-travel clock moves to another second.
     """
 
     def __init__(self, **kwargs):
         """Create the patch."""
         super(TimePatcher, self).__init__(patcher_module=__name__, **kwargs)
 
+        # The second of the cached results, and the results:
+        # {'localtime' / 'gmtime' / ... / ('strftime', format): result}
+        self._cached_second = None
+        self._second_cache = {}
+
     def get_patched_module(self):
         """Return list of the patches to do."""
         return time
 
     def get_patch_actions(self):
         """Return generator containing all patches to do."""
-        return [
+        patch_actions = [
             ('time', time.time, self._get_timestamp),
-            ('sleep', time.sleep, self._advance_time_stamp)
+            ('sleep', time.sleep, self._advance_time_stamp),
+            ('localtime', time.localtime, self._localtime),
+            ('gmtime', time.gmtime, self._gmtime),
+            ('ctime', time.ctime, self._ctime),
+            ('asctime', time.asctime, self._asctime),
+            ('strftime', time.strftime, self._strftime),
         ]
 
+        for name in CLOCKS:
+            if hasattr(time, name):
+                patch_actions.append((name,
+                                      getattr(time, name),
+                                      self._get_timestamp))
+
+        for name in NS_CLOCKS:
+            if hasattr(time, name):
+                patch_actions.append((name,
+                                      getattr(time, name),
+                                      self._get_timestamp_ns))
+
+        if _real_get_clock_info is not None and SimpleNamespace is not None:
+            patch_actions.append(('get_clock_info',
+                                  _real_get_clock_info,
+                                  self._get_clock_info))
+
+        return patch_actions
+
     def _get_timestamp(self):
         """Return the clock timestamp.
 
@@ -35,9 +95,97 @@ class TimePatcher(BasePatcher):
         """
         return self.clock.time
 
+    def _get_timestamp_ns(self):
+        """Return the clock timestamp in nanoseconds."""
+        return self.clock.time_ns
+
+    def _get_clock_info(self, name):
+        """Return information about a clock, as `time.get_clock_info` does.
+
+        The clock keeps the real clock's properties, but reports the
+        time-travel clock's implementation and resolution.
+        """
+        real_info = _real_get_clock_info(name)
+
+        return SimpleNamespace(implementation='time_travel',
+                               monotonic=real_info.monotonic,
+                               adjustable=real_info.adjustable,
+                               resolution=1e-09)
+
+    def _get_second_cache(self):
+        """Return the cached results of the clock's current second."""
+        second = int(self.clock.time)
+
+        if second != self._cached_second:
+            self._cached_second = second
+            self._second_cache = {}
+
+        return self._second_cache
+
+    def _localtime(self, secs=None):
+        """Return `time.localtime` of `secs`, or of the clock time."""
+        if secs is not None:
+            return _real_localtime(secs)
+
+        cache = self._get_second_cache()
+        result = cache.get('localtime')
+        if result is None:
+            result = cache['localtime'] = _real_localtime(self._cached_second)
+
+        return result
+
+    def _gmtime(self, secs=None):
+        """Return `time.gmtime` of `secs`, or of the clock time."""
+        if secs is not None:
+            return _real_gmtime(secs)
+
+        cache = self._get_second_cache()
+        result = cache.get('gmtime')
+        if result is None:
+            result = cache['gmtime'] = _real_gmtime(self._cached_second)
+
+        return result
+
+    def _ctime(self, secs=None):
+        """Return `time.ctime` of `secs`, or of the clock time."""
+        if secs is not None:
+            return _real_ctime(secs)
+
+        cache = self._get_second_cache()
+        result = cache.get('ctime')
+        if result is None:
+            result = cache['ctime'] = _real_ctime(self._cached_second)
+
+        return result
+
+    def _asctime(self, t=None):
+        """Return `time.asctime` of `t`, or of the clock's local time."""
+        if t is not None:
+            return _real_asctime(t)
+
+        cache = self._get_second_cache()
+        result = cache.get('asctime')
+        if result is None:
+            result = cache['asctime'] = _real_asctime(self._localtime())
+
+        return result
+
+    def _strftime(self, format, t=None):
+        """Return `time.strftime` of `t`, or of the clock's local time."""
+        if t is not None:
+            return _real_strftime(format, t)
+
+        cache = self._get_second_cache()
+        key = ('strftime', format)
+        result = cache.get(key)
+        if result is None:
+            result = cache[key] = _real_strftime(format, self._localtime())
+
+        return result
+
     def _advance_time_stamp(self, seconds):
         """Return the clock time.
 
         Used for the side_effect of sleep.
         """
-        self.clock.time += seconds
+        self.clock.advance(seconds)
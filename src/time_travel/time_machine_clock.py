@@ -1,11 +1,43 @@
 """A single clock for all patchers."""
 
+from __future__ import division
+
+import math
+
+from .timing_wheel import TimingWheel
+
 
 MIN_START_TIME = 86400.0  # Windows support unix times starting from 86,400.
 
+NS_PER_SEC = 10 ** 9
+
+
+def seconds_to_ns(seconds):
+    """Return the number of nanoseconds in `seconds` (rounded)."""
+    # Splitting the whole seconds out keeps the fraction's precision, which a
+    # plain `seconds * 1e9` would lose for times since the epoch.
+    whole = math.floor(seconds)
+    return int(whole) * NS_PER_SEC + int(round((seconds - whole) * 1e9))
+
 
 class TimeMachineClock(object):
-    """Unifing class for clock types."""
+    """Unifing class for clock types.
+
+    The time is kept as an integer number of nanoseconds, so stepping it with
+    `advance` (or `time_ns`) is exact however many steps are taken. The time in
+    seconds is a float view of it. When the time is set in seconds the
+    nanoseconds are only calculated once they are asked for.
+
+    Listeners are notified (with `listener.set_time(time)`) when the time
+    changes. A listener that has a `bind_clock(clock)` method is given the
+    clock when it is registered, and can then use `set_deadline` to only be
+    notified once the time reaches a deadline it is interested in. Listeners
+    that don't set a deadline are notified on every change.
+
+    Callbacks can be scheduled on the clock with `call_at` and `call_later`.
+    They are kept in a hierarchical timing wheel and are called, in order, as
+    the time moves past them.
+    """
 
     def __init__(self, start_time=MIN_START_TIME, clock_listeners=None):
         """Initialise a unified clock."""
@@ -14,11 +46,28 @@ class TimeMachineClock(object):
                              format(MIN_START_TIME, start_time))
 
         self._time = start_time
+        self._time_ns = seconds_to_ns(start_time)
+        self._last_step = (0, 0)
 
         self._clock_listeners = clock_listeners
         if clock_listeners is None:
             self._clock_listeners = []
 
+        # {id(listener): deadline}
+        self._deadlines = {}
+        self._next_deadline = float('-inf')
+
+        self._timers = TimingWheel(self._time_ns)
+        self._calling_timers = False
+        self.set_deadline(self._timers, float('inf'))
+
+        for listener in self._clock_listeners:
+            self.set_deadline(listener, float('-inf'))
+
+            bind_clock = getattr(listener, 'bind_clock', None)
+            if bind_clock is not None:
+                bind_clock(self)
+
     @property
     def time(self):
         """Get the clock time in seconds since the epoch."""
@@ -31,6 +80,152 @@ class TimeMachineClock(object):
         time - is time in seconds since the epoch.
         """
         self._time = float(time)
+        self._time_ns = None
+
+        if self._time >= self._next_deadline:
+            self._on_deadline()
+
+    @property
+    def time_ns(self):
+        """Get the clock time in nanoseconds since the epoch."""
+        if self._time_ns is None:
+            self._time_ns = seconds_to_ns(self._time)
+
+        return self._time_ns
+
+    @time_ns.setter
+    def time_ns(self, time_ns):
+        """Set the clock time.
+
+        time_ns - is time in nanoseconds since the epoch.
+        """
+        self._time_ns = int(time_ns)
+        self._time = self._time_ns / NS_PER_SEC
+
+        if self._time >= self._next_deadline:
+            self._on_deadline()
+
+    def advance(self, seconds):
+        """Move the clock forward by `seconds`.
+
+        Unlike `clock.time += seconds`, the step is added to the nanoseconds
+        count, so repeated steps don't accumulate float errors.
+        """
+        step, step_ns = self._last_step
+        if seconds != step:
+            step_ns = seconds_to_ns(seconds)
+            self._last_step = (seconds, step_ns)
+
+        self.time_ns = self.time_ns + step_ns
+
+    def call_at(self, timestamp, callback, *args):
+        """Call `callback(*args)` when the time gets to `timestamp`.
+
+        - timestamp: Time in seconds since the epoch.
+
+        The callback is called with the clock set to `timestamp` (timers set
+        to the past are called on the next time change, with the clock set to
+        the time they were set at). Return a `Timer` whose `cancel()` method
+        cancels the call.
+        """
+        return self._call_at_ns(seconds_to_ns(timestamp), callback, args)
+
+    def call_later(self, delay, callback, *args):
+        """Call `callback(*args)` `delay` seconds from now.
+
+        Return a `Timer` whose `cancel()` method cancels the call.
+        """
+        return self._call_at_ns(self.time_ns + seconds_to_ns(delay),
+                                callback,
+                                args)
+
+    def get_next_timer_time_ns(self, until_ns=None):
+        """Return the time of the next scheduled callback (None if none is).
+
+        - until_ns: Time in nanoseconds since the epoch. If given, only
+                    callbacks that are due by then are looked at.
+
+        The time is in nanoseconds, so setting `time_ns` to it calls exactly
+        the callbacks that are due by then.
+        """
+        timer = self._timers.peek_due(until_ns)
+        return None if timer is None else timer.when_ns
+
+    def set_deadline(self, listener, deadline):
+        """Set the time from which the listener should be notified.
+
+        - listener: One of the clock's listeners.
+        - deadline: Time in seconds since the epoch. The listener is notified
+                    of every time change to a time that is not earlier than
+                    the deadline (until it sets another deadline).
+        """
+        self._deadlines[id(listener)] = deadline
+        self._next_deadline = min(self._deadlines.values())
+
+    def _call_at_ns(self, when_ns, callback, args):
+        now_ns = self.time_ns
+
+        # The clock may have moved backwards since the wheel last moved.
+        self._timers.rewind(now_ns)
+
+        timer = self._timers.add(max(when_ns, now_ns), callback, args)
+        if when_ns / NS_PER_SEC < self._deadlines[id(self._timers)]:
+            self._update_timers_deadline()
+
+        return timer
+
+    def _update_timers_deadline(self):
+        deadline_ns = self._timers.get_deadline_ns()
+
+        if deadline_ns is None:
+            self.set_deadline(self._timers, float('inf'))
+        else:
+            # The float view of a time can be a little lower than its exact
+            # nanoseconds, so the deadline is set a microsecond earlier.
+            self.set_deadline(self._timers,
+                              (deadline_ns - 1000) / NS_PER_SEC)
+
+    def _on_deadline(self):
+        if not self._calling_timers and \
+                self._time >= self._deadlines[id(self._timers)]:
+            self._call_timers()
+
+        self._notify_listeners()
+
+    def _call_timers(self):
+        """Call the timers that are due, in order.
+
+        Each timer is called with the clock set to the timer's time, and the
+        listeners are notified of that time before it is called.
+        """
+        self._calling_timers = True
+        try:
+            target_ns, target = self.time_ns, self._time
+
+            while True:
+                timer = self._timers.pop_due(target_ns)
+                if timer is None:
+                    break
+
+                self._time_ns = timer.when_ns
+                self._time = timer.when_ns / NS_PER_SEC
+                self._notify_listeners()
+
+                timer.callback(*timer.args)
+
+                # The callback itself may have moved the clock forward.
+                if self.time_ns > target_ns:
+                    target_ns, target = self._time_ns, self._time
+
+            self._time_ns, self._time = target_ns, target
+        finally:
+            self._calling_timers = False
+            self._update_timers_deadline()
+
+    def _notify_listeners(self):
+        time = self._time
+        deadlines = self._deadlines
 
         for listener in self._clock_listeners:
-            listener.set_time(self._time)
+            if time >= deadlines.get(id(listener), float('-inf')):
+                listener.set_time(time)
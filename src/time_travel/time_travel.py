@@ -1,9 +1,12 @@
 """Mocking interface for python time libraries."""
 
-import pkg_resources
-
-from .time_machine_clock import TimeMachineClock, MIN_START_TIME
-from .event_pool import EventPool
+from .time_machine_clock import (TimeMachineClock,
+                                 MIN_START_TIME,
+                                 seconds_to_ns)
+from .event_pool import EventPool, CompactEventPool, _to_list
+from .patchers.base_patcher import ImportHook, start_patchers
+from .armed import ArmedPatchers
+from .patchers.registry import load_patchers
 
 
 class TimeTravel(object):
@@ -12,25 +15,47 @@ class TimeTravel(object):
     class EventTypes(object):
         """Empty class to register events types on."""
 
-    def __init__(self, start_time=MIN_START_TIME, **kwargs):
+    # The patchers installed by `arm`, if armed.
+    _armed = None
+
+    def __init__(self, start_time=MIN_START_TIME, compact_events=False,
+                 patch_imports=False, patchers=None, **kwargs):
         """Create the patch.
 
         @start_time is time in seconds since the epoch.
+        @compact_events makes the event pool store its events in a compact
+        layout, which saves memory for pools of millions of events.
+        @patch_imports patches modules that are imported after the start as
+        they are imported, so names they bind at import time
+        (`from time import time`) are patched and restored on stop as well.
+        @patchers is a list of the patchers to use (all of them if None), by
+        name ('time_patcher' or 'time') or events namespace ('select'). The
+        other patchers aren't imported at all.
+
+        While armed (see `arm`) the patching arguments are ignored, the
+        patchers installed by `arm` are used instead.
         """
-        self.event_pool = EventPool()
+        self.event_pool = CompactEventPool() if compact_events else EventPool()
         self.clock = TimeMachineClock(start_time, [self.event_pool])
 
-        patches = []
-        for patcher in pkg_resources.iter_entry_points(
-                group='time_travel.patchers'):
-            patches.append(patcher.load())
-
-        self.patches = [patcher(clock=self.clock, event_pool=self.event_pool,
-                                **kwargs)
-                        for patcher in patches]
+        if self._armed is not None:
+            self.patches = self._armed.patches
+        else:
+            self.patches = [patcher(clock=self.clock,
+                                    event_pool=self.event_pool,
+                                    **kwargs)
+                            for patcher in load_patchers(patchers)]
 
         self.event_types = self.EventTypes()
 
+        # {fd: handler}
+        self._event_handlers = {}
+
+        self._patch_imports = patch_imports
+        self._import_hook = None
+        self._armed_by = None
+        self._previous = None
+
         for patcher in self.patches:
             if patcher.get_events_namespace() is not None:
                 setattr(self.event_types,
@@ -44,17 +69,208 @@ class TimeTravel(object):
         :param fd: The descriptor (usually a socket object) that the event will
                    happen for.
         :param event: The event that will happen (implementation specific).
+
+        Return a handle whose ``cancel()`` method cancels the event.
         """
         abs_time = self.clock.time + time_from_now
-        self.event_pool.add_future_event(abs_time, fd, event)
+        return self.event_pool.add_future_event(abs_time, fd, event)
+
+    def add_periodic_event(self, interval, fd, event, until=None, count=None):
+        """Add an event that recurs every `interval` seconds.
+
+        :param interval: Seconds between occurrences, the first occurrence
+                         happens `interval` seconds from now.
+        :param fd: The descriptor that the event will happen for.
+        :param event: The event that will happen (implementation specific).
+        :param until: Seconds from now after which the event stops recurring
+                      (unlimited if None).
+        :param count: Number of occurrences (unlimited if None).
+
+        The event pool only holds the next occurrence of the event at any time.
+
+        Return a handle whose ``cancel()`` method stops the series.
+        """
+        now = self.clock.time
+        abs_until = None if until is None else now + until
+
+        return self.event_pool.add_periodic_event(now + interval,
+                                                  interval,
+                                                  fd,
+                                                  event,
+                                                  until=abs_until,
+                                                  count=count)
+
+    def add_future_events(self, times_from_now, fds, events):
+        """Add many events to the event pool at once.
+
+        :param times_from_now: When will the events happen.
+        :param fds: The descriptors that the events will happen for.
+        :param events: The events that will happen (implementation specific).
+
+        The arguments are parallel sequences, the i'th event is
+        ``(times_from_now[i], fds[i], events[i])``. NumPy arrays (or any
+        array type with a ``tolist`` method) are accepted as well.
+        """
+        now = self.clock.time
+        abs_times = [now + time_from_now
+                     for time_from_now in _to_list(times_from_now)]
+
+        self.event_pool.add_future_events(abs_times, fds, events)
+
+    def set_event_handler(self, fd, handler):
+        """Dispatch the events of `fd` to `handler` in `run_until`.
+
+        :param fd: The descriptor whose events are handled.
+        :param handler: Called as ``handler(fd, event)`` for each of the fd's
+                        events, with the clock set to the event's time.
+        """
+        self._event_handlers[fd] = handler
+
+    def remove_event_handler(self, fd):
+        """Stop dispatching the events of `fd` in `run_until`."""
+        del self._event_handlers[fd]
+
+    def run_until(self, timestamp):
+        """Run the simulation until `timestamp`.
+
+        :param timestamp: Time in seconds since the epoch.
+
+        The clock jumps from event to event, and each event of an fd that has
+        a handler (see `set_event_handler`) is removed from the event pool and
+        dispatched to it. Callbacks scheduled on the clock are called in order
+        with the events. Events of fds without a handler are left for the
+        patched modules (and expire as the clock passes them).
+
+        The events of a single timestamp are all removed before any of them is
+        dispatched, like the results of a single ``select`` call.
+
+        The clock is left at `timestamp`. Return the number of dispatched
+        events.
+        """
+        dispatched = self._run(timestamp)
+
+        if self.clock.time < timestamp:
+            self.clock.time = timestamp
+
+        return dispatched
+
+    def run_until_idle(self):
+        """Run the simulation until there are no events or callbacks left.
+
+        Like `run_until`, but without a time limit. The clock is left at the
+        time of the last event or callback. Periodic events without an end
+        keep the simulation running forever.
+
+        Return the number of dispatched events.
+        """
+        return self._run(None)
+
+    def _run(self, until):
+        clock = self.clock
+        event_pool = self.event_pool
+        handlers = self._event_handlers
+
+        def has_handler(fd, event):
+            return fd in handlers
+
+        dispatched = 0
+        while True:
+            if handlers:
+                # The pool is walked in chronological order up to the first
+                # handled event (or `until`), which is cheaper than looking up
+                # every handled fd's next event when there are many of them.
+                timestamp, fd_events = event_pool.get_next_event(has_handler,
+                                                                 until)
+            else:
+                timestamp, fd_events = None, []
+
+            limit = until if timestamp is None else timestamp
+            timer_ns = clock.get_next_timer_time_ns(
+                None if limit is None else seconds_to_ns(limit))
+
+            if timer_ns is not None:
+                # A callback may add (or remove) events, so the next event is
+                # looked up again after it.
+                clock.time_ns = timer_ns
+                continue
+
+            if timestamp is None:
+                return dispatched
+
+            if timestamp > clock.time:
+                clock.time = timestamp
+
+            for fd, events in fd_events:
+                for event in events:
+                    event_pool.remove_event_from_fd(timestamp, fd, event)
+
+            for fd, events in fd_events:
+                handler = handlers.get(fd)
+                for event in events:
+                    if handler is not None:
+                        handler(fd, event)
+                        dispatched += 1
+
+    @classmethod
+    def arm(cls, patch_imports=False, patchers=None, **kwargs):
+        """Install the fakes once, for all the TimeTravel contexts that follow.
+
+        The keyword arguments are the patching arguments of `TimeTravel`.
+
+        While armed the fakes stay installed and call the real functions when
+        no TimeTravel is active, so entering and leaving a TimeTravel context
+        only switches the clock and event pool the fakes use. Meant for test
+        sessions with many short TimeTravel contexts.
+        """
+        if cls._armed is not None:
+            raise RuntimeError('TimeTravel is already armed')
+
+        armed = ArmedPatchers(load_patchers(patchers),
+                              patch_imports=patch_imports,
+                              **kwargs)
+        armed.start()
+        cls._armed = armed
+
+    @classmethod
+    def disarm(cls):
+        """Remove the fakes installed by `arm`."""
+        if cls._armed is None:
+            return
+
+        cls._armed.activate(None)
+        cls._armed.stop()
+        cls._armed = None
 
     def start(self):
-        """Start all the patchers."""
-        for patcher in self.patches:
-            patcher.start()
+        """Start all the patchers.
+
+        The loaded modules are searched once for the objects of all patchers.
+        While armed, only make this TimeTravel the active one.
+        """
+        if self._armed is not None:
+            self._armed_by = self._armed
+            self._previous = self._armed.activate(self)
+            return
+
+        start_patchers(self.patches)
+
+        if self._patch_imports:
+            self._import_hook = ImportHook(self.patches)
+            self._import_hook.install()
 
     def stop(self):
         """Stop all the patchers."""
+        if self._armed_by is not None:
+            if self._armed_by is self._armed:
+                self._armed_by.activate(self._previous)
+
+            self._armed_by = self._previous = None
+            return
+
+        if self._import_hook is not None:
+            self._import_hook.uninstall()
+            self._import_hook = None
+
         for patcher in self.patches:
             patcher.stop()
 
@@ -0,0 +1,248 @@
+"""A hierarchical timing wheel for callbacks scheduled on the clock."""
+
+import heapq
+import itertools
+
+
+class Timer(object):
+    """A callback that is scheduled to be called at a given time."""
+
+    __slots__ = ('when_ns', 'seq', 'callback', 'args', 'cancelled', '_wheel')
+
+    def __init__(self, wheel, when_ns, seq, callback, args):
+        """Create a timer that is due at `when_ns` nanoseconds."""
+        self.when_ns = when_ns
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+        self._wheel = wheel
+
+    def cancel(self):
+        """Cancel the timer.
+
+        The timer is only marked as cancelled, and is dropped when the wheel
+        gets to it. Cancelling a timer that was already called (or cancelled)
+        does nothing.
+        """
+        if not self.cancelled:
+            self.cancelled = True
+            if self._wheel is not None:
+                self._wheel._pending -= 1
+                self._wheel = None
+
+
+class TimingWheel(object):
+    """A hierarchical timing wheel.
+
+    Time is divided to ticks of `resolution_ns` nanoseconds. The wheel has
+    `levels` levels of 2 ** `bits` slots each: a slot in level 0 holds the
+    timers of a single tick, and a slot in level `l` holds the timers of
+    2 ** (bits * l) ticks. A timer is put in the lowest level whose slots
+    cover its tick, and is moved down a level (cascaded) when the wheel gets
+    to its slot. Timers that are too far for the top level are kept in an
+    overflow heap.
+
+    Adding and cancelling a timer are O(1). The timers of the current tick are
+    kept in `self._ready`, a heap ordered by (time, insertion order), so timers
+    are always popped in order.
+
+    The slots that hold timers are marked in a bitmask per level, so the wheel
+    jumps straight to the next occupied slot however far it is.
+    """
+
+    def __init__(self, now_ns, resolution_ns=10 ** 6, bits=8, levels=4):
+        """Create a wheel whose current tick is the one of `now_ns`."""
+        self._resolution_ns = resolution_ns
+        self._bits = bits
+        self._mask = (1 << bits) - 1
+        self._levels = levels
+
+        self._slots = [[None] * (1 << bits) for _ in range(levels)]
+        self._occupied = [0] * levels
+        self._overflow = []
+        self._ready = []
+
+        self._current = now_ns // resolution_ns
+        self._counter = itertools.count()
+        self._pending = 0
+
+    def __len__(self):
+        """Return the number of pending (not cancelled) timers."""
+        return self._pending
+
+    def add(self, when_ns, callback, args=()):
+        """Schedule `callback(*args)` for `when_ns` and return its `Timer`."""
+        timer = Timer(self, when_ns, next(self._counter), callback, args)
+        self._pending += 1
+        self._insert(timer)
+        return timer
+
+    def get_deadline_ns(self):
+        """Return a lower bound of the next timer's time (None if none)."""
+        if not self._pending:
+            return None
+
+        if self._ready:
+            return self._ready[0][0]
+
+        tick = self._find_next_tick()[0]
+        return None if tick is None else tick * self._resolution_ns
+
+    def peek_due(self, limit_ns=None):
+        """Return the next timer that is due by `limit_ns` (None if none is).
+
+        The timer is left in the wheel. The wheel moves forward to the tick of
+        the returned timer (or of `limit_ns`, if no timer is due), so it should
+        only be called with times the clock is moving to. With no `limit_ns`
+        the next timer is returned however far it is.
+        """
+        limit_tick = None
+        if limit_ns is not None:
+            limit_tick = limit_ns // self._resolution_ns
+
+        while self._pending:
+            ready = self._ready
+            while ready and ready[0][2].cancelled:
+                heapq.heappop(ready)
+
+            if ready:
+                if limit_ns is not None and ready[0][0] > limit_ns:
+                    return None
+
+                return ready[0][2]
+
+            tick, level, index = self._find_next_tick()
+            if tick is None or \
+                    (limit_tick is not None and tick > limit_tick):
+                break
+
+            self._current = tick
+            if level is None:
+                self._cascade_overflow()
+            else:
+                self._cascade(level, index)
+
+        if limit_tick is not None and limit_tick > self._current:
+            self._current = limit_tick
+
+        return None
+
+    def pop_due(self, limit_ns):
+        """Pop the next timer that is due by `limit_ns` (None if none is).
+
+        The wheel moves as in `peek_due`.
+        """
+        timer = self.peek_due(limit_ns)
+
+        if timer is not None:
+            heapq.heappop(self._ready)
+            self._pending -= 1
+            timer._wheel = None
+
+        return timer
+
+    def rewind(self, now_ns):
+        """Move the wheel back to the tick of `now_ns` (if it is ahead of it).
+
+        Used when the clock moves backwards: the pending timers are inserted
+        again relative to the new tick.
+        """
+        if now_ns // self._resolution_ns >= self._current:
+            return
+
+        timers = [timer for _, _, timer in self._ready]
+        timers.extend(timer for _, _, timer in self._overflow)
+
+        for level in range(self._levels):
+            slots = self._slots[level]
+            for index, slot in enumerate(slots):
+                if slot:
+                    timers.extend(slot)
+                    slots[index] = None
+
+            self._occupied[level] = 0
+
+        self._ready = []
+        self._overflow = []
+        self._current = now_ns // self._resolution_ns
+
+        for timer in timers:
+            if not timer.cancelled:
+                self._insert(timer)
+
+    def _insert(self, timer):
+        tick = max(timer.when_ns // self._resolution_ns, self._current)
+
+        if tick == self._current:
+            heapq.heappush(self._ready, (timer.when_ns, timer.seq, timer))
+            return
+
+        bits = self._bits
+        current = self._current
+        for level in range(self._levels):
+            if tick >> (bits * (level + 1)) == current >> (bits * (level + 1)):
+                index = (tick >> (bits * level)) & self._mask
+
+                slot = self._slots[level][index]
+                if slot is None:
+                    self._slots[level][index] = [timer]
+                    self._occupied[level] |= 1 << index
+                else:
+                    slot.append(timer)
+
+                return
+
+        heapq.heappush(self._overflow, (timer.when_ns, timer.seq, timer))
+
+    def _find_next_tick(self):
+        """Return (tick, level, index) of the next occupied slot.
+
+        The level and index are None for the overflow heap, and all are None if
+        the wheel is empty.
+        """
+        bits = self._bits
+        current = self._current
+
+        for level in range(self._levels):
+            position = (current >> (bits * level)) & self._mask
+            if level > 0:
+                # The current slot of the upper levels was already cascaded.
+                position += 1
+
+            occupied = self._occupied[level] >> position
+            if occupied:
+                index = position + (occupied & -occupied).bit_length() - 1
+                window_bits = bits * (level + 1)
+                window = current >> window_bits << window_bits
+                return window | (index << (bits * level)), level, index
+
+        if self._overflow:
+            top_bits = bits * self._levels
+            tick = self._overflow[0][0] // self._resolution_ns
+            return max(tick >> top_bits << top_bits, current), None, None
+
+        return None, None, None
+
+    def _cascade(self, level, index):
+        """Move a slot's timers to the lower levels (or to `_ready`)."""
+        slot = self._slots[level][index]
+        self._slots[level][index] = None
+        self._occupied[level] &= ~(1 << index)
+
+        for timer in slot:
+            if not timer.cancelled:
+                self._insert(timer)
+
+    def _cascade_overflow(self):
+        """Move the overflow timers that the wheel now covers into it."""
+        top_bits = self._bits * self._levels
+        window = self._current >> top_bits
+        overflow = self._overflow
+
+        while overflow and \
+                overflow[0][0] // self._resolution_ns >> top_bits <= window:
+            timer = heapq.heappop(overflow)[2]
+            if not timer.cancelled:
+                self._insert(timer)